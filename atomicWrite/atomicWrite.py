@@ -0,0 +1,51 @@
+import os
+import shutil
+import tempfile
+import contextlib
+from typing import IO, Iterable, Iterator
+
+# Atomic file replacement shared by the scripts that rewrite files in place.
+# The new content is written to a temporary file in the same directory, which
+# then replaces the original with os.replace, so an interrupted run never
+# leaves a half-written file behind. The temporary file gets a unique name
+# from mkstemp: no file of the user is overwritten or deleted, and two runs
+# rewriting the same file at once do not write to the same temporary file.
+
+def _umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+@contextlib.contextmanager
+def open_atomic(path: str, encoding: str = 'utf-8') -> Iterator[IO[str]]:
+    """
+    Open a temporary text file that replaces path when the block exits without
+    an error, and is removed otherwise. Nothing is translated on write
+    (newline=''), so line endings are kept as given. The mode of an existing
+    file is kept, and a symlink is followed so that its target is replaced.
+    """
+    path = os.path.realpath(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix='.tmp', dir=os.path.dirname(path))
+    try:
+        with open(fd, 'w', encoding=encoding, newline='') as file:
+            yield file
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        else:
+            # mkstemp creates the file private to the user; give a new file the usual mode
+            os.chmod(tmp_path, 0o666 & ~_umask())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+
+def write_atomic(path: str, content: str, encoding: str = 'utf-8') -> None:
+    """Replace the content of path atomically."""
+    with open_atomic(path, encoding) as file:
+        file.write(content)
+
+def write_lines_atomic(path: str, lines: Iterable[str], encoding: str = 'utf-8') -> None:
+    """Replace the content of path atomically with lines produced one by one, e.g. while streaming the old content."""
+    with open_atomic(path, encoding) as file:
+        file.writelines(lines)
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import argparse
+import functools
+import importlib
+
+# Only the modules above are imported at startup. A tool, and with it PyYAML,
+# sqlite3 or multiprocessing, is imported when its command runs, so --help and
+# the small commands start in milliseconds.
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+# command -> (folder, module, help); every module exposes cli(argv, prog) returning an exit status
+COMMANDS = {
+    'openapi': ('openApiGenerator', 'openApiGenerator', "Generate OpenAPI contracts for Spring Boot controllers"),
+    'ts': ('javaEntityToTsGenerator', 'javaEntityToTsGenerator', "Generate TypeScript interfaces from Java JPA entities"),
+    'dto': ('responseRequestGenerator', 'responseRequestGenerator', "Generate Request/Response POJOs for Java JPA entities"),
+    'remove-console-logs': ('remove-console-logs', 'remove_console_logs', "Remove console statements from .ts, .tsx and .vue files"),
+    'remove-blank-lines': ('remove-extra-blank-lines', 'remove_extra_blank_lines',
+                           "Collapse consecutive blank lines in .ts, .tsx and .vue files"),
+    'parse-cache': ('javaParseCache', 'javaParseCache', "Inspect or invalidate the Java parse cache shared by the Java tools"),
+    'walk': ('sourceWalker', 'sourceWalker', "List the files the tools walk, honoring .gitignore"),
+    'changed': ('gitChangedFiles', 'gitChangedFiles', "List the staged or changed files the cleanup scripts would process"),
+}
+
+# Pipeline steps in the order they run: DTOs come first so the OpenAPI and TypeScript
+# steps see them, and blank lines are collapsed after console statements are removed
+PIPELINE_STEPS = ('dto', 'openapi', 'ts', 'remove-console-logs', 'remove-blank-lines')
+FRONTEND_EXTENSIONS = ('.ts', '.tsx', '.vue')
+
+# Frontend step -> name of its transform in the module of the step. A transform takes
+# the content of a file and returns its new content; --transform adds more of them,
+# which run before the blank lines are collapsed.
+FRONTEND_TRANSFORMS = {
+    'remove-console-logs': 'strip_console_statements',
+    'remove-blank-lines': 'collapse_blank_lines',
+}
+
+# Frontend step -> byte-level check of its module telling whether a file may need the
+# transform at all. Only when every transform to run has one are the other files skipped
+# without being decoded.
+FRONTEND_PREFILTERS = {
+    'remove-console-logs': 'contains_console',
+}
+
+def import_from(folder, module):
+    """Import a module of this repository from its folder."""
+    path = os.path.normpath(os.path.join(REPO_DIR, folder))
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return importlib.import_module(module)
+
+def load(command):
+    folder, module, _ = COMMANDS[command]
+    return import_from(folder, module)
+
+def walk(root, walker):
+    """Collect the Java and frontend sources under root in a single traversal."""
+    java_files, frontend_files = [], []
+    for path in walker.files(root, ('.java',) + FRONTEND_EXTENSIONS):
+        (java_files if path.endswith('.java') else frontend_files).append(path)
+    return java_files, frontend_files
+
+def warm_parse_cache(parse_cache, java_files, jobs=1):
+    """Read and parse every Java file once, so the Java steps only stat them."""
+    if parse_cache.connect() is None:
+        return
+    if jobs > 1 and len(java_files) > 1:
+        import multiprocessing
+        with multiprocessing.Pool(min(jobs, len(java_files))) as pool:
+            for _ in pool.imap_unordered(_warm_file, ((parse_cache, path) for path in java_files), chunksize=64):
+                pass
+    else:
+        for path in java_files:
+            _warm_file((parse_cache, path))
+
+def _warm_file(task):
+    parse_cache, path = task
+    try:
+        parse_cache.parse(path)
+    except OSError:
+        pass  # reported by the step that needs the file
+
+def load_transform(spec):
+    """Import a transform given as MODULE:FUNCTION, where MODULE is a module name or a .py file."""
+    module_name, _, function_name = spec.rpartition(':')
+    if not module_name or not function_name:
+        raise ValueError(f"{spec}: expected MODULE:FUNCTION")
+    if module_name.endswith('.py'):
+        # Imported by name from its folder, so worker processes can import the transform too
+        folder = os.path.dirname(os.path.abspath(module_name))
+        name = os.path.splitext(os.path.basename(module_name))[0]
+        if folder not in sys.path:
+            sys.path.insert(0, folder)
+        module = importlib.import_module(name)
+        loaded_from = getattr(module, '__file__', None) or ''
+        if os.path.normcase(os.path.abspath(loaded_from)) != os.path.normcase(os.path.abspath(module_name)):
+            raise ValueError(f"{spec}: {name} is already the name of another module")
+    else:
+        module = importlib.import_module(module_name)
+    transform = getattr(module, function_name, None)
+    if not callable(transform):
+        raise ValueError(f"{spec}: {module_name} has no function {function_name}")
+    return transform
+
+# Transforms of the process, set in each worker process by _init_frontend_worker
+_frontend_transforms = []
+
+def _init_frontend_worker(transforms):
+    global _frontend_transforms
+    _frontend_transforms = transforms
+
+def _clean_frontend_file(file_path):
+    """
+    Read a file once, apply every transform in order and write it once if it
+    changed. Returns (file_path, names of the transforms that changed it, error);
+    runs in the worker processes.
+    """
+    write_atomic = import_from('atomicWrite', 'atomicWrite').write_atomic
+    changed_by = []
+    try:
+        # newline='' hands the original line breaks to the transforms
+        with open(file_path, 'r', encoding='utf-8', newline='') as file:
+            content = file.read()
+        new_content = content
+        for name, transform in _frontend_transforms:
+            transformed = transform(new_content)
+            if transformed != new_content:
+                changed_by.append(name)
+                new_content = transformed
+        if new_content != content:
+            write_atomic(file_path, new_content)
+    except Exception as e:
+        return file_path, changed_by, e
+    return file_path, changed_by, None
+
+def _picklable(value):
+    import pickle
+    try:
+        pickle.dumps(value)
+    except Exception:
+        return False
+    return True
+
+def clean_frontend_files(file_paths, transforms, jobs=1, prefilter=None):
+    """
+    Apply every (name, transform) in order to each file, reading and writing it
+    at most once; the summary counts the files each transform changed. With a
+    prefilter, only the files it accepts are read. With jobs > 1 the files are
+    cleaned by a process pool, unless a transform cannot be sent to it.
+    """
+    modified_count = 0
+    errors = 0
+    counts = dict.fromkeys((name for name, _ in transforms), 0)
+    if prefilter is not None:
+        # Most files need none of the transforms: only those that may are decoded
+        matches = []
+        for file_path in file_paths:
+            try:
+                if prefilter(file_path):
+                    matches.append(file_path)
+            except OSError as e:
+                print(f"Error processing {file_path}: {e}")
+                errors += 1
+        file_paths = matches
+    if jobs > 1 and len(file_paths) > 1 and _picklable(transforms):
+        import multiprocessing
+        pool = multiprocessing.Pool(min(jobs, len(file_paths)), initializer=_init_frontend_worker, initargs=(transforms,))
+        cleaned = pool.imap(_clean_frontend_file, file_paths, chunksize=max(1, min(64, len(file_paths) // (jobs * 4))))
+    else:
+        pool = None
+        _init_frontend_worker(transforms)
+        cleaned = map(_clean_frontend_file, file_paths)
+    try:
+        for file_path, changed_by, error in cleaned:
+            if error is not None:
+                print(f"Error processing {file_path}: {error}")
+                errors += 1
+                continue
+            for name in changed_by:
+                counts[name] += 1
+            if changed_by:
+                print(f"Modified: {file_path}")
+                modified_count += 1
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    print(f"Completed! Modified {modified_count} files.")
+    for name, count in counts.items():
+        print(f"  {name:<24} {count} files")
+    return errors
+
+def frontend_transforms(steps, max_blank_lines=None, extra_transforms=()):
+    """
+    Return the (name, transform) pairs to apply to the frontend files: console
+    statements are removed first, then the extra transforms run, and the blank
+    lines any of them left behind are collapsed last.
+    """
+    transforms = []
+    for step, function_name in FRONTEND_TRANSFORMS.items():
+        if step == 'remove-blank-lines':
+            transforms.extend(extra_transforms)
+        if step in steps:
+            transform = getattr(load(step), function_name)
+            if step == 'remove-blank-lines' and max_blank_lines is not None:
+                transform = functools.partial(transform, max_blank_lines=max_blank_lines)
+            transforms.append((step, transform))
+    return transforms
+
+def frontend_prefilter(steps, extra_transforms=()):
+    """
+    Return a check telling whether a file may need any of the frontend transforms,
+    or None when every file has to be read: a custom transform or a step without
+    a byte-level check could change any file.
+    """
+    frontend_steps = [step for step in FRONTEND_TRANSFORMS if step in steps]
+    if extra_transforms or not frontend_steps or any(step not in FRONTEND_PREFILTERS for step in frontend_steps):
+        return None
+    prefilters = [getattr(load(step), FRONTEND_PREFILTERS[step]) for step in frontend_steps]
+    if len(prefilters) == 1:
+        return prefilters[0]
+    return lambda file_path: any(prefilter(file_path) for prefilter in prefilters)
+
+def run_pipeline(root, steps, jobs=1, parse_cache=None, walker=None, max_blank_lines=None, extra_transforms=()):
+    """
+    Run the given steps over one walk of root; returns the exit status.
+    extra_transforms are (name, transform) pairs applied to the frontend files
+    before their blank lines are collapsed.
+    """
+    java_files, frontend_files = walk(root, walker or load('walk').SourceWalker())
+    print(f"{len(java_files)} Java and {len(frontend_files)} frontend files under {root}")
+    failed = False
+
+    java_steps = [step for step in PIPELINE_STEPS[:3] if step in steps]
+    if java_steps and parse_cache is not None:
+        warm_parse_cache(parse_cache, java_files, jobs)
+    for step in java_steps:
+        print(f"\n== {step} ==")
+        if step == 'dto':
+            results = load('dto').main(root, jobs, parse_cache=parse_cache, java_files=java_files)
+            # The new DTOs are sources of the tree for the following steps
+            java_files.extend(results['created'])
+            failed |= bool(results['errors'])
+        elif step == 'openapi':
+            failures = load('openapi').process_directory(root, jobs=jobs, parse_cache=parse_cache, java_files=java_files)
+            if failures:
+                print(f"{len(failures)} hata oluştu.")
+            failed |= bool(failures)
+        else:
+            load('ts').main(root, cache=parse_cache, java_files=java_files)
+
+    transforms = frontend_transforms(steps, max_blank_lines, extra_transforms)
+    if transforms:
+        print(f"\n== {' + '.join(name for name, _ in transforms)} ==")
+        prefilter = frontend_prefilter(steps, extra_transforms)
+        failed |= bool(clean_frontend_files(frontend_files, transforms, jobs, prefilter))
+    return 1 if failed else 0
+
+def pipeline_cli(argv):
+    parse_cache_module = load('parse-cache')
+    walker_module = load('walk')
+    parser = argparse.ArgumentParser(prog="easy_scripts.py pipeline",
+                                     description="Run several tools over a single walk and read of the tree.")
+    parser.add_argument("root_dir", help="Root directory of the sources")
+    parser.add_argument("steps", nargs="*", metavar="STEP",
+                        help=f"Steps to run, any of: {', '.join(PIPELINE_STEPS)}; they always run in this order")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Number of worker processes (0 = CPU count, default: 1)")
+    parser.add_argument("--transform", action="append", default=[], metavar="MODULE:FUNCTION",
+                        help="Also apply FUNCTION(content) -> content of MODULE (a module name or a .py file) "
+                             "to the frontend files, before remove-blank-lines (repeatable)")
+    parser.add_argument("--max-blank-lines", type=int, metavar="N",
+                        help="Consecutive blank lines kept by remove-blank-lines (default: 1)")
+    parse_cache_module.add_cache_arguments(parser)
+    walker_module.add_walk_arguments(parser)
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.root_dir):
+        parser.error(f"{args.root_dir} is not a directory")
+    invalid = [step for step in args.steps if step not in PIPELINE_STEPS]
+    if invalid:
+        parser.error(f"invalid STEP: {', '.join(invalid)} (choose from {', '.join(PIPELINE_STEPS)})")
+    if not args.steps and not args.transform:
+        parser.error("at least one STEP or --transform is required")
+    if args.max_blank_lines is not None and args.max_blank_lines < 0:
+        parser.error("--max-blank-lines must be 0 or more")
+    try:
+        extra_transforms = [(spec.rpartition(':')[2], load_transform(spec)) for spec in args.transform]
+    except (ImportError, OSError, ValueError) as e:
+        parser.error(str(e))
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    return run_pipeline(args.root_dir, set(args.steps), jobs, parse_cache_module.cache_from_arguments(args),
+                        walker_module.walker_from_arguments(args), args.max_blank_lines, extra_transforms)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    commands = "\n".join(f"  {command:<20} {help_text}" for command, (_, _, help_text) in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        prog="easy_scripts.py", formatter_class=argparse.RawDescriptionHelpFormatter,
+        description="Run the easy-scripts tools from one entry point.",
+        epilog=f"commands:\n{commands}\n  {'pipeline':<20} Run several tools over a single walk of the tree\n\n"
+               "Run 'easy_scripts.py COMMAND --help' for the options of a command.")
+    parser.add_argument("command", choices=[*COMMANDS, 'pipeline'], metavar="COMMAND")
+    # Only the command name is parsed here; the rest belongs to the tool
+    args = parser.parse_args(argv[:1])
+    if args.command == 'pipeline':
+        return pipeline_cli(argv[1:])
+    return load(args.command).cli(argv[1:], prog=f"easy_scripts.py {args.command}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+import os
+import sys
+import argparse
+import subprocess
+from typing import Any, Iterable, List, Optional, TextIO, Tuple
+
+# Changed-file selection shared by the cleanup scripts. Instead of walking the
+# whole source tree, a pre-commit hook or a CI job hands over the staged files,
+# the files changed since a base revision, or a list of paths, and only those
+# are processed.
+
+class ChangedFilesError(Exception):
+    """Raised when the file list cannot be obtained, e.g. outside a git repository."""
+
+def run_git(args: List[str], directory: str) -> str:
+    try:
+        result = subprocess.run(['git', '-C', directory] + args, capture_output=True, check=True,
+                                text=True, encoding='utf-8', errors='surrogateescape')
+    except FileNotFoundError:
+        raise ChangedFilesError("git is not installed")
+    except subprocess.CalledProcessError as e:
+        raise ChangedFilesError(f"git {' '.join(args)}: {e.stderr.strip() or e}")
+    return result.stdout
+
+def git_diff_files(diff_args: List[str], directory: str = '.') -> List[str]:
+    """Return the added, copied, modified and renamed files of a git diff, as paths usable from the current directory."""
+    top_level = run_git(['rev-parse', '--show-toplevel'], directory).strip()
+    output = run_git(['diff', '--name-only', '-z', '--diff-filter=ACMR'] + diff_args, directory)
+    return [os.path.relpath(os.path.join(top_level, name)) for name in output.split('\0') if name]
+
+def staged_files(directory: str = '.') -> List[str]:
+    return git_diff_files(['--cached'], directory)
+
+def unstaged_files(directory: str = '.') -> List[str]:
+    """Return the files whose working tree differs from the index, like git diff --name-only."""
+    return git_diff_files([], directory)
+
+def changed_since(base: str, directory: str = '.') -> List[str]:
+    """Return the files that differ between base and the working tree, like git diff --name-only base."""
+    return git_diff_files([base, '--'], directory)
+
+def read_file_list(stream: TextIO, null: bool = False) -> List[str]:
+    """Read paths separated by new lines, or by NUL characters with null set."""
+    data = stream.read()
+    if null:
+        return [path for path in data.split('\0') if path]
+    return [path for path in data.splitlines() if path.strip()]
+
+def select_files(paths: Iterable[str], root: str, extensions: Optional[Tuple[str, ...]] = None,
+                 walker: Any = None) -> List[str]:
+    """
+    Keep the existing files under root, optionally only those with one of the
+    extensions, in order and without duplicates. With a SourceWalker, the files
+    a walk of root would skip are dropped too.
+    """
+    root_path = os.path.abspath(root)
+    selected = []
+    seen = set()
+    for path in paths:
+        path = os.path.normpath(path)
+        absolute = os.path.abspath(path)
+        if absolute in seen or extensions is not None and not path.endswith(extensions):
+            continue
+        seen.add(absolute)
+        if os.path.commonpath([root_path, absolute]) != root_path or not os.path.isfile(path):
+            continue
+        if walker is not None and walker.ignores(root, path):
+            continue
+        selected.append(path)
+    return selected
+
+def split_unstaged(paths: Iterable[str], directory: str = '.') -> Tuple[List[str], List[str]]:
+    """
+    Split paths into the files without unstaged changes and those with some,
+    e.g. a partially staged file. git add would commit the unstaged changes of
+    the latter along with the cleanup, so --restage leaves them untouched. Call
+    this before any file is modified.
+    """
+    unstaged = {os.path.abspath(path) for path in unstaged_files(directory)}
+    clean: List[str] = []
+    held_back: List[str] = []
+    for path in paths:
+        (held_back if os.path.abspath(path) in unstaged else clean).append(path)
+    return clean, held_back
+
+def tracked_files(paths: Iterable[str], directory: str = '.') -> List[str]:
+    """Keep the paths that are in the git index, like git ls-files --cached; untracked files are dropped."""
+    paths = list(paths)
+    if not paths:
+        return []
+    top_level = run_git(['rev-parse', '--show-toplevel'], directory).strip()
+    output = run_git(['--literal-pathspecs', 'ls-files', '--cached', '--full-name', '-z', '--']
+                     + [os.path.abspath(path) for path in paths], directory)
+    tracked = {os.path.abspath(os.path.join(top_level, name)) for name in output.split('\0') if name}
+    return [path for path in paths if os.path.abspath(path) in tracked]
+
+def restage(paths: List[str]) -> List[str]:
+    """
+    Add the given files to the git index again, e.g. after a pre-commit hook
+    changed them. Only files already in the index are added: an untracked file
+    the hook cleaned stays untracked. Returns the files that were added.
+    """
+    paths = tracked_files(paths)
+    if paths:
+        run_git(['--literal-pathspecs', 'add', '--'] + [os.path.abspath(path) for path in paths], '.')
+    return paths
+
+def add_changed_files_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("changed files")
+    source = group.add_mutually_exclusive_group()
+    source.add_argument("--staged", action="store_true", help="Only process the files staged in git")
+    source.add_argument("--since", metavar="BASE",
+                        help="Only process the files changed since BASE, like git diff --name-only BASE")
+    source.add_argument("--files-from", metavar="FILE",
+                        help="Only process the files listed in FILE, one per line ('-' reads stdin)")
+    group.add_argument("-0", "--null", action="store_true", help="Paths in --files-from are separated by NUL characters")
+
+def add_hook_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add --restage and --check, for the scripts that modify the files they process."""
+    group = parser.add_argument_group("hooks")
+    group.add_argument("--restage", action="store_true",
+                       help="git add the modified files that are tracked by git; files with unstaged changes (e.g. "
+                            "partially staged ones) are left untouched and reported, and the exit status is 1")
+    group.add_argument("--check", action="store_true",
+                       help="Only report the files that would be modified; the exit status is 1 if there are any")
+
+def check_changed_files_arguments(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.null and not args.files_from:
+        parser.error("--null requires --files-from")
+    if getattr(args, 'restage', False) and getattr(args, 'check', False):
+        parser.error("--restage cannot be combined with --check")
+
+def changed_files_from_arguments(args: argparse.Namespace, root: str, extensions: Optional[Tuple[str, ...]] = None,
+                                 walker: Any = None) -> Optional[List[str]]:
+    """Return the files selected by the arguments, or None when the whole tree is to be walked."""
+    if args.staged:
+        paths = staged_files(root if os.path.isdir(root) else '.')
+    elif args.since:
+        paths = changed_since(args.since, root if os.path.isdir(root) else '.')
+    elif args.files_from == '-':
+        paths = read_file_list(sys.stdin, args.null)
+    elif args.files_from:
+        try:
+            with open(args.files_from, 'r', encoding='utf-8', newline='') as file:
+                paths = read_file_list(file, args.null)
+        except OSError as e:
+            raise ChangedFilesError(f"{args.files_from}: {e.strerror}")
+    else:
+        return None
+    return select_files(paths, root, extensions, walker)
+
+def cli(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog=prog, description="List the changed files the cleanup scripts would process "
+                                                            "(default: the staged files).")
+    parser.add_argument("root_dir", nargs="?", default=".", help="Only list files under this directory (default: .)")
+    parser.add_argument("-e", "--extension", action="append", dest="extensions", metavar="EXT",
+                        help="Only list files with this extension, e.g. .ts (repeatable)")
+    add_changed_files_arguments(parser)
+    args = parser.parse_args(argv)
+    check_changed_files_arguments(parser, args)
+    if not (args.staged or args.since or args.files_from):
+        args.staged = True
+    try:
+        paths = changed_files_from_arguments(args, args.root_dir, tuple(args.extensions) if args.extensions else None)
+    except ChangedFilesError as e:
+        parser.error(str(e))
+    for path in paths:
+        print(path)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(cli())
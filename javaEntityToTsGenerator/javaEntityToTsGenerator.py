@@ -1,46 +1,155 @@
 import os
 import re
+import sys
+import json
+import posixpath
+import time
+import argparse
 import multiprocessing
 
-def find_java_files(directory):
-    for root, dirs, files in os.walk(directory):
-        for file in files:
-            if file.endswith('.java'):
-                yield os.path.join(root, file)
+# The Java lexer and its on-disk parse cache are shared with the other Java tools
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'javaParseCache'))
+from javaParseCache import JavaParseCache, parse_java_type, add_cache_arguments, cache_from_arguments
+# Directory walker honoring .gitignore, shared by every script
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'sourceWalker'))
+from sourceWalker import SourceWalker, add_walk_arguments, walker_from_arguments
+# Stage profiler behind --profile, shared with the other tools
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'stageProfiler'))
+from stageProfiler import Profiler
+
+profiler = Profiler()
+
+# Raw bytes of an entity or enum declaration. The keyword is matched with the
+# whitespace that follows it: in a JPA tree most files import from an enums
+# package, and a bare b'enum' would let all of them pass the byte-level check.
+ENTITY_MARKERS = (b'@Entity', b'enum ', b'enum\t', b'enum\n', b'enum\r')
+
+# Parse cache of the process, replaced in each parse worker by init_parse_worker
+parse_cache = JavaParseCache(None)
+
+# Lookup tables shipped to each generation worker once by init_worker
+worker_output_dir = None
+worker_converter = None
+worker_entity_paths = {}
+
+def init_parse_worker(profile, cache):
+    global profiler, parse_cache
+    profiler = Profiler(profile)
+    parse_cache = cache
+
+def init_worker(profile, output_dir=None, entities=None, entity_paths=None, enums=None):
+    global profiler, worker_output_dir, worker_converter, worker_entity_paths
+    profiler = Profiler(profile)
+    worker_output_dir = output_dir
+    worker_converter = TsTypeConverter(entities or set(), enums)
+    worker_entity_paths = entity_paths or {}
+
+def stream_tasks(pool, func, items, workers):
+    """Run func over items with imap_unordered, queueing a bounded window of chunks at a time."""
+    chunksize = max(1, min(64, len(items) // (workers * 4)))
+    window = chunksize * workers * 8
+    for start in range(0, len(items), window):
+        yield from pool.imap_unordered(func, items[start:start + window], chunksize)
+
+def find_java_files(directory, walker=None):
+    return (walker or SourceWalker()).files(directory, ('.java',))
 
 def extract_entity_info(file_path):
-    with open(file_path, 'r', encoding='utf-8') as file:
-        content = file.read()
-        if '@Entity' in content:
-            class_name = re.search(r'class\s+(\w+)', content)
-            package_name = re.search(r'package\s+([\w.]+);', content)
-            fields = re.findall(r'private\s+(\w+(?:\s*<\s*\w+\s*>)?)\s+(\w+);', content)
-            if class_name and fields:
-                return class_name.group(1), fields, package_name.group(1) if package_name else None
-    return None, None, None
-
-def create_ts_file(class_name, fields, output_dir, entities, package_path, entity_paths):
+    # Files without @Entity or an enum declaration are never decoded or parsed unless already cached
+    source = parse_cache.parse(file_path, ENTITY_MARKERS, profiler)
+    if source is None:
+        return None, None, None, {}
+    enums = {declaration.name: declaration.constants for declaration in source.classes if declaration.kind == 'enum'}
+    entity = source.find_class('Entity')
+    if entity:
+        fields = [(field.type, field.name) for field in source.instance_fields(entity.name)]
+        if fields:
+            return entity.name, fields, source.package, enums
+    return None, None, None, enums
+
+def create_ts_file(class_name, fields, output_dir, converter, package_path, entity_paths):
     # Create the directory structure based on the package path
     ts_dir = os.path.join(output_dir, *package_path.split('.'))
     os.makedirs(ts_dir, exist_ok=True)
 
-    imports = generate_imports(fields, entities, class_name, entity_paths, package_path)
-    ts_content = f"""{imports}
+    with profiler.span('transform', path=class_name):
+        imports = generate_imports(fields, converter, class_name, entity_paths, package_path)
+        ts_content = f"""{imports}
 
-export interface {class_name} {{
-{generate_ts_fields(fields, entities)}
+{render_interface(class_name, fields, converter)}"""
+    ts_file = os.path.join(ts_dir, f"{class_name}.ts")
+    return ts_file, write_if_changed(ts_file, ts_content)
+
+def render_interface(class_name, fields, converter):
+    return f"""export interface {class_name} {{
+{generate_ts_fields(fields, converter)}
 }}
 """
-    ts_file = os.path.join(ts_dir, f"{class_name}.ts")
-    with open(ts_file, 'w', encoding='utf-8') as file:
-        file.write(ts_content)
-    print(f"Created TypeScript file: {ts_file}")
 
-def generate_imports(fields, entities, current_class, entity_paths, current_package):
+def create_package_bundle(package_name, package_entities, output_dir, converter, entity_paths):
+    """Write all entities of a package to one module, e.g. ts_models/com/example/entity.ts."""
+    package_parts = package_name.split('.')
+    os.makedirs(os.path.join(output_dir, *package_parts[:-1]), exist_ok=True)
+
+    with profiler.span('transform', path=package_name):
+        # Entities of the same bundle need no import; other bundles are imported once per package
+        imported = {}
+        for _, fields, _ in package_entities:
+            for field_type, _ in fields:
+                for name in converter.referenced_entities(field_type):
+                    import_package = entity_paths.get(name)
+                    if import_package and import_package != package_name:
+                        imported.setdefault(import_package, set()).add(name)
+        imports = []
+        for import_package in sorted(imported):
+            rel_path = posixpath.relpath('/'.join(import_package.split('.')), '/'.join(package_parts[:-1]) or '.')
+            if not rel_path.startswith('.'):
+                rel_path = './' + rel_path
+            imports.append(f"import type {{ {', '.join(sorted(imported[import_package]))} }} from '{rel_path}';")
+        interfaces = '\n'.join(render_interface(class_name, fields, converter)
+                               for class_name, fields, _ in sorted(package_entities))
+        ts_content = '\n'.join(imports) + '\n\n' + interfaces if imports else interfaces
+    ts_file = os.path.join(output_dir, *package_parts[:-1], f"{package_parts[-1]}.ts")
+    return ts_file, write_if_changed(ts_file, ts_content)
+
+def create_global_declarations(parsed, output_dir, converter, entity_paths):
+    """Write every entity to a single ts_models/models.d.ts without imports."""
+    with profiler.span('transform', path=output_dir):
+        interfaces = []
+        for class_name, fields, package_name in sorted(parsed):
+            # Names are global here; the entity the lookup tables point to wins
+            if entity_paths[class_name] != package_name:
+                print(f"Skipping {package_name}.{class_name}: name already used by {entity_paths[class_name]}.{class_name}")
+                continue
+            interfaces.append(render_interface(class_name, fields, converter))
+        ts_content = '\n'.join(interfaces)
+    ts_file = os.path.join(output_dir, 'models.d.ts')
+    return ts_file, write_if_changed(ts_file, ts_content)
+
+def write_if_changed(ts_file, ts_content):
+    """Write ts_file only if its content differs, so unchanged files keep their mtime."""
+    data = ts_content.encode('utf-8')
+    try:
+        with open(ts_file, 'rb') as file:
+            if file.read() == data:
+                return 'unchanged'
+        status = 'updated'
+    except FileNotFoundError:
+        status = 'created'
+    with profiler.span('write', path=ts_file):
+        # Binary mode keeps the bytes identical to the comparison above
+        with open(ts_file, 'wb') as file:
+            file.write(data)
+        profiler.count('bytes_written', len(data))
+    return status
+
+def generate_imports(fields, converter, current_class, entity_paths, current_package):
     imports = set()
+    referenced = set()
     for field_type, _ in fields:
-        base_type = field_type.split('<')[0]
-        if base_type in entities and base_type != current_class:
+        referenced |= converter.referenced_entities(field_type)
+    for base_type in referenced:
+        if base_type != current_class:
             # Get the package path for the imported entity
             if base_type in entity_paths:
                 import_package = entity_paths[base_type]
@@ -73,71 +182,217 @@ def generate_imports(fields, entities, current_class, entity_paths, current_pack
                     imports.add(f"import type {{ {base_type} }} from '{rel_path}/{base_type}';")
     return '\n'.join(sorted(imports))
 
-def generate_ts_fields(fields, entities):
-    return '\n'.join(f"  {field_name}: {java_to_ts_type(field_type, entities)};" for field_type, field_name in fields)
-
-def java_to_ts_type(java_type, entities):
-    if '<' in java_type:
-        base_type, inner_type = re.match(r'(\w+)\s*<\s*(\w+)\s*>', java_type).groups()
-        return f"{java_to_ts_type(base_type, entities)}<{java_to_ts_type(inner_type, entities)}>"
-    type_mappings = {
-        "String": "string", "int": "number", "Integer": "number",
-        "long": "number", "Long": "number",
-        "float": "number", "Float": "number",
-        "double":"number",  "Double": "number",
-        "boolean": "boolean", "Boolean": "boolean",
-        "byte": "boolean", "Byte": "boolean",
-        "short": "number", "Short": "number",
-        "BigDecimal": "number", "BigInteger": "number",
-        "LocalTime": "Date", "ZonedDateTime": "Date", "LocalDate": "Date",
-        "Time": "Date", "Timestamp": "Date", "Instant": "Date",
-        "byte[]": "string", "Byte[]": "string", "byte[][]": "string", "Byte[][]": "string",
-        "char[]": "string", "Character[]": "string", "char[][]": "string", "Character[][]": "string",
-        "String[]": "string[]", "String[][]": "string[]",
-        "List<String>": "string[]", "List<Integer>": "number[]", "List<Long>": "number[]",
-        "List<Long>": "number[]", "List<Float>": "number[]", "List<Double>": "number[]",
-        "List<BigDecimal>": "number[]", "List<BigInteger>": "number[]",
-        "List<Boolean>": "boolean[]", "List<Byte>": "boolean[]", "List<Short>": "number[]",
-        "List<LocalTime>": "Date[]", "List<ZonedDateTime>": "Date[]", "List<LocalDate>": "Date[]",
-        "List<Time>": "Date[]", "List<Timestamp>": "Date[]", "List<Instant>": "Date[]",
-        "List<byte[]>": "string[]", "List<byte[][]>": "string[]",
-        "List<char[]>": "string[]", "List<char[][]>": "string[]",
-        "List<String[]>": "string[][]", "List<String[][]>": "string[][]",
-        "List<List<String>>": "string[][]", "List<List<Integer>>": "number[][]", "List<List<Long>>": "number[][]",
-        "List<List<Long>>": "number[][]", "List<List<Float>>": "number[][]", "List<List<Double>>": "number[][]",
-        "List<List<BigDecimal>>": "number[][]", "List<List<BigInteger>>": "number[][]",
-        "char": "string", "Character": "string",
-        "List": "Array<any>", "Set": "Set<any>", "UUID": "string",
-        "Date": "Date", "DateTime": "Date", "LocalDate": "Date", "ZonedDateTime": "Date"
-    }
-    return type_mappings.get(java_type, java_type if java_type in entities else "any")
-
-def process_file(args):
-    java_file, output_dir, entities, entity_paths = args
-    class_name, fields, package_name = extract_entity_info(java_file)
-    if class_name and fields and package_name:
-        create_ts_file(class_name, fields, output_dir, entities, package_name, entity_paths)
-
-def main(root_directory):
+def generate_ts_fields(fields, converter):
+    return '\n'.join(f"  {field_name}: {converter.convert(field_type)};" for field_type, field_name in fields)
+
+# Java types with a fixed TypeScript equivalent
+TS_TYPE_MAPPINGS = {
+    "String": "string", "char": "string", "Character": "string", "UUID": "string",
+    "int": "number", "Integer": "number", "long": "number", "Long": "number",
+    "float": "number", "Float": "number", "double": "number", "Double": "number",
+    "short": "number", "Short": "number", "BigDecimal": "number", "BigInteger": "number",
+    "boolean": "boolean", "Boolean": "boolean", "byte": "boolean", "Byte": "boolean",
+    "Date": "Date", "DateTime": "Date", "LocalDate": "Date", "LocalDateTime": "Date", "LocalTime": "Date",
+    "ZonedDateTime": "Date", "OffsetDateTime": "Date", "Time": "Date", "Timestamp": "Date", "Instant": "Date",
+    "Object": "any"
+}
+TS_COLLECTION_TYPES = {'List', 'ArrayList', 'LinkedList', 'Set', 'HashSet', 'LinkedHashSet', 'TreeSet',
+                       'SortedSet', 'Collection', 'Iterable'}
+TS_MAP_TYPES = {'Map', 'HashMap', 'LinkedHashMap', 'TreeMap', 'SortedMap', 'ConcurrentHashMap'}
+# Arrays of these are serialized as strings
+TS_STRING_ARRAY_TYPES = {'byte', 'Byte', 'char', 'Character'}
+
+class TsTypeConverter:
+    """Converts Java type expressions to TypeScript.
+
+    Entities map to their interface, enums to a union of their constants.
+    Every distinct type string is converted once and then served from a cache.
+    """
+    def __init__(self, entities, enums=None):
+        self.entities = entities
+        self.enums = enums or {}
+        self.cache = {}
+
+    def convert(self, java_type):
+        ts_type = self.cache.get(java_type)
+        if ts_type is None:
+            ts_type = self.cache[java_type] = self.convert_node(parse_java_type(java_type))
+        return ts_type
+
+    def convert_node(self, node):
+        name, arguments, array_depth = node.name, node.arguments, node.array_depth
+        if array_depth:
+            if name in TS_STRING_ARRAY_TYPES:
+                ts_type, array_depth = "string", array_depth - 1
+            else:
+                ts_type = self.convert_node(node._replace(array_depth=0))
+            return self.array_of(ts_type, array_depth)
+        if name == '?':
+            # Wildcards: '? extends T' is a T, anything else is unknown
+            return self.convert_node(arguments[0]) if node.bound == 'extends' else "any"
+        if name in TS_TYPE_MAPPINGS:
+            return TS_TYPE_MAPPINGS[name]
+        if name in TS_COLLECTION_TYPES:
+            return self.array_of(self.convert_node(arguments[0]) if arguments else "any", 1)
+        if name in TS_MAP_TYPES:
+            key_type = self.convert_node(arguments[0]) if len(arguments) == 2 else "string"
+            value_type = self.convert_node(arguments[1]) if len(arguments) == 2 else "any"
+            # Record keys must be strings or numbers
+            return f"Record<{key_type if key_type in ('string', 'number') else 'string'}, {value_type}>"
+        if name == 'Optional':
+            return self.convert_node(arguments[0]) if arguments else "any"
+        if name in self.entities:
+            return name
+        if name in self.enums:
+            return ' | '.join(f"'{constant}'" for constant in self.enums[name]) or "string"
+        return "any"
+
+    @staticmethod
+    def array_of(ts_type, depth):
+        if depth and ' | ' in ts_type:
+            ts_type = f"({ts_type})"
+        return ts_type + "[]" * depth
+
+    def referenced_entities(self, java_type):
+        """Return the entity names used by the converted type, skipping enum literals."""
+        ts_type = re.sub(r"'[^']*'", '', self.convert(java_type))
+        return {name for name in re.findall(r'[A-Za-z_$][\w$]*', ts_type) if name in self.entities}
+
+# Files written by the previous run, used to remove models of deleted entities
+MANIFEST_NAME = '.generated.json'
+
+def load_generated(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), 'r', encoding='utf-8') as file:
+            return set(json.load(file))
+    except (FileNotFoundError, ValueError):
+        return set()
+
+def save_generated(output_dir, ts_files):
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w', encoding='utf-8') as file:
+        json.dump(sorted(os.path.relpath(ts_file, output_dir).replace(os.sep, '/') for ts_file in ts_files), file, indent=2)
+
+def remove_stale(output_dir, ts_files):
+    """Delete files generated by the previous run that were not generated now."""
+    current = {os.path.relpath(ts_file, output_dir).replace(os.sep, '/') for ts_file in ts_files}
+    removed = []
+    for relative_path in sorted(load_generated(output_dir) - current):
+        ts_file = os.path.join(output_dir, *relative_path.split('/'))
+        if os.path.exists(ts_file):
+            os.remove(ts_file)
+            removed.append(ts_file)
+            # Drop package directories left empty
+            directory = os.path.dirname(ts_file)
+            while directory != output_dir and not os.listdir(directory):
+                os.rmdir(directory)
+                directory = os.path.dirname(directory)
+    return removed
+
+def parse_file(java_file):
+    """Read and parse a Java file once; the result is reused by the generation pass."""
+    profiler.count('files')
+    with profiler.span('file', 'file', path=java_file):
+        entity = extract_entity_info(java_file)
+    return java_file, entity, profiler.collect() if profiler.enabled else None
+
+def process_package(bundle):
+    package_name, package_entities = bundle
+    with profiler.span('package', 'file', path=package_name):
+        ts_file, status = create_package_bundle(package_name, package_entities, worker_output_dir, worker_converter, worker_entity_paths)
+    return ts_file, status, profiler.collect() if profiler.enabled else None
+
+def process_file(entity):
+    class_name, fields, package_name = entity
+    with profiler.span('entity', 'file', path=f"{package_name}.{class_name}"):
+        ts_file, status = create_ts_file(class_name, fields, worker_output_dir, worker_converter, package_name, worker_entity_paths)
+    return ts_file, status, profiler.collect() if profiler.enabled else None
+
+def main(root_directory, profile_path=None, verbose=False, bundle='entity', cache=None, java_files=None, walker=None):
+    global profiler, parse_cache
+    profiler = Profiler(profile_path is not None)
+    parse_cache = cache or JavaParseCache(None)
+    workers = os.cpu_count() or 1
+
     output_dir = os.path.join(root_directory, 'ts_models')
     os.makedirs(output_dir, exist_ok=True)
 
     entities = set()
     entity_paths = {}
 
-    # First pass: collect all entity names and their package paths
-    for java_file in find_java_files(root_directory):
-        class_name, _, package_name = extract_entity_info(java_file)
+    # java_files is the list already collected by a caller such as the easy_scripts pipeline
+    with profiler.span('walk', path=root_directory):
+        java_files = list(find_java_files(root_directory, walker) if java_files is None else java_files)
+
+    # First pass: parse every file once and collect all entity names, their package paths and the enums
+    results = {}
+    parse_cache.connect()
+    with multiprocessing.Pool(workers, initializer=init_parse_worker, initargs=(profiler.enabled, parse_cache)) as pool:
+        for java_file, entity, profile_data in stream_tasks(pool, parse_file, java_files, workers):
+            if profile_data:
+                profiler.merge(profile_data)
+            if entity[0] and entity[2] or entity[3]:
+                results[java_file] = entity
+    # Walk order keeps the result deterministic when two classes share a name
+    parsed = []
+    enums = {}
+    for class_name, fields, package_name, file_enums in (results[java_file] for java_file in java_files if java_file in results):
+        enums.update(file_enums)
         if class_name and package_name:
             entities.add(class_name)
             entity_paths[class_name] = package_name
+            parsed.append((class_name, fields, package_name))
 
-    # Second pass: generate TypeScript files with proper imports
-    with multiprocessing.Pool() as pool:
-        pool.map(process_file, [(f, output_dir, entities, entity_paths) for f in find_java_files(root_directory)])
+    # Second pass: generate TypeScript files from the parsed results; the lookup
+    # tables are sent to each worker once instead of with every task
+    statuses = {}
+    if bundle == 'global':
+        ts_file, status = create_global_declarations(parsed, output_dir, TsTypeConverter(entities, enums), entity_paths)
+        statuses[ts_file] = status
+    else:
+        if bundle == 'package':
+            packages = {}
+            for entity in parsed:
+                packages.setdefault(entity[2], []).append(entity)
+            func, tasks = process_package, sorted(packages.items())
+        else:
+            func, tasks = process_file, parsed
+        with multiprocessing.Pool(workers, initializer=init_worker,
+                                  initargs=(profiler.enabled, output_dir, entities, entity_paths, enums)) as pool:
+            for ts_file, status, profile_data in stream_tasks(pool, func, tasks, workers):
+                if profile_data:
+                    profiler.merge(profile_data)
+                statuses[ts_file] = status
 
-if __name__ == "__main__":
-    root_dir = input("Enter the root directory to search (e.g., src/main/java): ")
-    main(root_dir)
+    for ts_file in remove_stale(output_dir, statuses):
+        statuses[ts_file] = 'deleted'
+    save_generated(output_dir, [ts_file for ts_file, status in statuses.items() if status != 'deleted'])
+
+    if verbose:
+        for ts_file, status in sorted(statuses.items()):
+            if status != 'unchanged':
+                print(f"{status.capitalize()}: {ts_file}")
+    counts = {status: list(statuses.values()).count(status) for status in ('created', 'updated', 'unchanged', 'deleted')}
+    print(f"TypeScript files from {len(java_files)} Java files: {counts['created']} created, {counts['updated']} updated, "
+          f"{counts['unchanged']} unchanged, {counts['deleted']} deleted.")
+
+    if profiler.enabled:
+        profiler.write(profile_path)
+
+def cli(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Generate TypeScript interfaces from Java JPA entities.")
+    parser.add_argument("root_dir", nargs="?", help="Root directory to search (prompted if omitted)")
+    parser.add_argument("--profile", nargs="?", const="javaEntityToTsGenerator_profile.json", metavar="PATH",
+                        help="Write a Chrome trace of the run with per-file and per-stage spans")
+    parser.add_argument("-v", "--verbose", action="store_true", help="List every generated file")
+    parser.add_argument("--bundle", choices=["entity", "package", "global"], default="entity",
+                        help="One file per entity (default), one module per package, or a single models.d.ts")
+    add_cache_arguments(parser)
+    add_walk_arguments(parser)
+    args = parser.parse_args(argv)
+    root_dir = args.root_dir or input("Enter the root directory to search (e.g., src/main/java): ")
+    main(root_dir, args.profile, args.verbose, args.bundle, cache_from_arguments(args), walker=walker_from_arguments(args))
     print("\nTypeScript models have been generated in the 'ts_models' directory with the same package structure as Java.")
+    return 0
 
+if __name__ == "__main__":
+    sys.exit(cli())
@@ -0,0 +1,763 @@
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+import functools
+import contextlib
+from typing import Dict, List, Tuple, Any, Optional, Iterable, NamedTuple
+
+# Stage profiler of the tools, passed in by the caller of JavaParseCache.parse
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'stageProfiler'))
+from stageProfiler import Profiler
+
+# Java source lexer shared by the openApiGenerator, javaEntityToTsGenerator and
+# responseRequestGenerator parsers.
+# Every alternative consumes input without backtracking into earlier text,
+# so tokenizing is linear in the size of the file.
+JAVA_TOKEN_RE = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<text_block>"""(?:[^\\]|\\.)*?""")
+  | (?P<string>"(?:[^"\\\n]|\\.)*")
+  | (?P<char>'(?:[^'\\\n]|\\.)*')
+  | (?P<ident>[A-Za-z_$][\w$]*)
+  | (?P<number>\d[\w.]*)
+  | (?P<symbol>\.\.\.|.)
+''', re.VERBOSE | re.DOTALL)
+
+JAVA_MODIFIERS = {
+    'public', 'protected', 'private', 'static', 'final', 'abstract', 'default',
+    'synchronized', 'native', 'transient', 'volatile', 'strictfp', 'sealed'
+}
+
+JAVA_TYPE_KEYWORDS = {'class', 'interface', 'enum', 'record'}
+
+class JavaToken(NamedTuple):
+    kind: str
+    value: str
+    start: int
+    end: int
+
+class JavaAnnotation(NamedTuple):
+    name: str
+    arguments: Dict[str, List[JavaToken]]
+
+    def string(self, *keys: str) -> Optional[str]:
+        """Return the first string literal of the first present argument."""
+        for key in keys:
+            for token in self.arguments.get(key, []):
+                if token.kind == 'string':
+                    return token.value[1:-1]
+        return None
+
+    def identifier(self, key: str) -> Optional[str]:
+        """Return the last identifier of an argument (e.g. GET for RequestMethod.GET)."""
+        idents = [token.value for token in self.arguments.get(key, []) if token.kind == 'ident']
+        return idents[-1] if idents else None
+
+class JavaClass(NamedTuple):
+    annotations: List[JavaAnnotation]
+    modifiers: List[str]
+    kind: str
+    name: str
+    owner: Optional[str]
+    constants: List[str]  # enum constants, empty for other kinds
+
+class JavaField(NamedTuple):
+    annotations: List[JavaAnnotation]
+    modifiers: List[str]
+    type: str
+    name: str
+    owner: str
+
+class JavaMethod(NamedTuple):
+    annotations: List[JavaAnnotation]
+    modifiers: List[str]
+    return_type: str
+    name: str
+    parameters: str
+    owner: str
+
+class JavaType(NamedTuple):
+    """Node of a parsed type expression such as Map<String, List<Foo>>[]."""
+    name: str
+    arguments: Tuple['JavaType', ...] = ()
+    array_depth: int = 0
+    bound: Optional[str] = None  # 'extends' or 'super' for wildcards
+
+class JavaSource:
+    """Declarations collected from a single Java source file."""
+    def __init__(self):
+        self.package: Optional[str] = None
+        self.classes: List[JavaClass] = []
+        self.fields: List[JavaField] = []
+        self.methods: List[JavaMethod] = []
+
+    def find_annotation(self, annotations: List[JavaAnnotation], name: str) -> Optional[JavaAnnotation]:
+        return next((annotation for annotation in annotations if annotation.name == name), None)
+
+    def find_class(self, annotation: str) -> Optional[JavaClass]:
+        """Return the first class carrying the annotation, e.g. Entity."""
+        return next((declaration for declaration in self.classes if self.find_annotation(declaration.annotations, annotation)), None)
+
+    def instance_fields(self, owner: str) -> List[JavaField]:
+        """Return the private, non-static fields declared by a class."""
+        return [field for field in self.fields if field.owner == owner and 'private' in field.modifiers and 'static' not in field.modifiers]
+
+def tokenize_java(source: str) -> List[JavaToken]:
+    """Split Java source into tokens, dropping whitespace and comments."""
+    return [
+        JavaToken(match.lastgroup, match.group(), match.start(), match.end())
+        for match in JAVA_TOKEN_RE.finditer(source)
+        if match.lastgroup not in ('space', 'comment')
+    ]
+
+def format_java_type(tokens: List[JavaToken]) -> str:
+    """Render type tokens in a canonical form such as Map<String, List<Foo>>."""
+    parts = []
+    for token in tokens:
+        if token.value == ',':
+            parts.append(', ')
+        elif token.value in ('extends', 'super', '&'):
+            parts.append(f' {token.value} ')
+        else:
+            parts.append(token.value)
+    return ''.join(parts)
+
+def split_top_level(tokens: List[JavaToken], separator: str = ',') -> List[List[JavaToken]]:
+    """Split tokens on separators that are not nested inside brackets or generics."""
+    groups: List[List[JavaToken]] = [[]]
+    depth = 0
+    for token in tokens:
+        if token.kind == 'symbol':
+            if token.value in '(<[{':
+                depth += 1
+            elif token.value in ')>]}':
+                depth -= 1
+            elif token.value == separator and depth == 0:
+                groups.append([])
+                continue
+        groups[-1].append(token)
+    return [group for group in groups if group]
+
+def split_generic_type(type_text: str) -> Tuple[str, List[str]]:
+    """Split a type like Map<String, List<Foo>> into ('Map', ['String', 'List<Foo>'])."""
+    tokens = tokenize_java(type_text)
+    if '<' not in type_text:
+        return format_java_type(tokens), []
+    open_index = next(i for i, token in enumerate(tokens) if token.value == '<')
+    close_index = len(tokens) - 1
+    while close_index > open_index and tokens[close_index].value != '>':
+        close_index -= 1
+    base = format_java_type(tokens[:open_index])
+    return base, [format_java_type(group) for group in split_top_level(tokens[open_index + 1:close_index])]
+
+def split_parameters(parameters: str) -> List[str]:
+    """Split a method parameter list on top-level commas only."""
+    tokens = tokenize_java(parameters)
+    return [parameters[group[0].start:group[-1].end] for group in split_top_level(tokens)]
+
+class JavaLexer:
+    """Single-pass scanner producing annotations, classes, fields and methods."""
+    def __init__(self, source: str):
+        self.source = source
+        self.tokens = tokenize_java(source)
+        self.pos = 0
+
+    def _peek(self, offset: int = 0) -> Optional[JavaToken]:
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else None
+
+    def _at(self, value: str, offset: int = 0) -> bool:
+        token = self._peek(offset)
+        return token is not None and token.value == value and token.kind == 'symbol'
+
+    def _skip_group(self, open_symbol: str, close_symbol: str) -> int:
+        """Skip a balanced group starting at the current token; return the index of its closing token."""
+        depth = 0
+        while self.pos < len(self.tokens):
+            token = self.tokens[self.pos]
+            self.pos += 1
+            if token.kind != 'symbol':
+                continue
+            if token.value == open_symbol:
+                depth += 1
+            elif token.value == close_symbol:
+                depth -= 1
+                if depth == 0:
+                    return self.pos - 1
+        return len(self.tokens) - 1
+
+    def _skip_statement(self) -> None:
+        """Skip to the end of the current statement, stepping over nested blocks."""
+        depth = 0
+        while self.pos < len(self.tokens):
+            token = self.tokens[self.pos]
+            if token.kind == 'symbol':
+                if token.value in '({[':
+                    depth += 1
+                elif token.value in ')}]':
+                    if depth == 0:
+                        return
+                    depth -= 1
+                elif token.value == ';' and depth == 0:
+                    self.pos += 1
+                    return
+            self.pos += 1
+
+    def _read_qualified_name(self) -> str:
+        parts = []
+        while self._peek() is not None and self._peek().kind == 'ident':
+            parts.append(self._peek().value)
+            self.pos += 1
+            if self._at('.') and self._peek(1) is not None and self._peek(1).kind == 'ident':
+                self.pos += 1
+            else:
+                break
+        return '.'.join(parts)
+
+    def read_annotation(self) -> JavaAnnotation:
+        """Read an annotation starting at '@', including its argument list."""
+        self.pos += 1
+        name = self._read_qualified_name().split('.')[-1]
+        arguments: Dict[str, List[JavaToken]] = {}
+        if self._at('('):
+            start = self.pos
+            end = self._skip_group('(', ')')
+            for group in split_top_level(self.tokens[start + 1:end]):
+                if len(group) > 1 and group[0].kind == 'ident' and group[1].value == '=':
+                    arguments[group[0].value] = group[2:]
+                else:
+                    arguments['value'] = group
+        return JavaAnnotation(name, arguments)
+
+    def read_type(self) -> Optional[str]:
+        """Read a type expression including generics, arrays and varargs."""
+        token = self._peek()
+        if token is None or token.kind != 'ident':
+            return None
+        tokens = []
+        while True:
+            tokens.append(self.tokens[self.pos])
+            self.pos += 1
+            if self._at('.') and self._peek(1) is not None and self._peek(1).kind == 'ident':
+                tokens.append(self.tokens[self.pos])
+                self.pos += 1
+            else:
+                break
+        if self._at('<'):
+            depth = 0
+            while self.pos < len(self.tokens):
+                token = self.tokens[self.pos]
+                if token.value == '@':
+                    self.read_annotation()
+                    continue
+                tokens.append(token)
+                self.pos += 1
+                if token.value == '<':
+                    depth += 1
+                elif token.value == '>':
+                    depth -= 1
+                    if depth == 0:
+                        break
+        while (self._at('[') and self._at(']', 1)) or self._at('...'):
+            if self._at('...'):
+                tokens.append(self.tokens[self.pos])
+                self.pos += 1
+            else:
+                tokens.extend(self.tokens[self.pos:self.pos + 2])
+                self.pos += 2
+        return format_java_type(tokens)
+
+    def parse_type(self) -> JavaType:
+        """Parse the type expression at the current token into a JavaType tree."""
+        while self._at('@'):
+            self.read_annotation()
+        if self._at('?'):
+            self.pos += 1
+            token = self._peek()
+            if token is not None and token.value in ('extends', 'super'):
+                self.pos += 1
+                return JavaType('?', (self.parse_type(),), 0, token.value)
+            return JavaType('?')
+
+        # Qualified names (java.util.List) resolve to their simple name
+        name = 'Object'
+        while self._peek() is not None and self._peek().kind == 'ident':
+            name = self._peek().value
+            self.pos += 1
+            if self._at('.'):
+                self.pos += 1
+            else:
+                break
+
+        arguments = []
+        if self._at('<'):
+            self.pos += 1
+            while self._peek() is not None and not self._at('>'):
+                if self._at(',') or self._at('&'):
+                    self.pos += 1
+                    continue
+                start = self.pos
+                arguments.append(self.parse_type())
+                # Step over unexpected symbols instead of looping on them
+                if self.pos == start:
+                    self.pos += 1
+            self.pos += 1
+
+        array_depth = 0
+        while self._at('[') or self._at('...'):
+            array_depth += 1
+            self.pos += 1 if self._at('...') else 2
+        return JavaType(name, tuple(arguments), array_depth)
+
+    def scan(self) -> JavaSource:
+        """Scan the whole file in one pass."""
+        result = JavaSource()
+        self.pos = 0
+        self._scan_members(result, None)
+        return result
+
+    def _scan_members(self, result: JavaSource, owner: Optional[JavaClass]) -> None:
+        annotations: List[JavaAnnotation] = []
+        modifiers: List[str] = []
+        while self.pos < len(self.tokens):
+            token = self.tokens[self.pos]
+            value = token.value
+
+            if token.kind == 'symbol':
+                if value == '}':
+                    self.pos += 1
+                    return
+                if value == '@' and not (self._peek(1) and self._peek(1).value == 'interface'):
+                    annotations.append(self.read_annotation())
+                    continue
+                if value == '@':
+                    self.pos += 1
+                    continue
+                if value == '{':
+                    # Initializer block
+                    self._skip_group('{', '}')
+                elif value == '<':
+                    # Type parameters of a generic method
+                    self._skip_group('<', '>')
+                    continue
+                else:
+                    self.pos += 1
+                annotations, modifiers = [], []
+                continue
+
+            if token.kind != 'ident':
+                self.pos += 1
+                continue
+
+            if owner is None and value in ('package', 'import'):
+                self.pos += 1
+                name = self._read_qualified_name()
+                if value == 'package':
+                    result.package = name
+                self._skip_statement()
+                continue
+
+            if value in JAVA_MODIFIERS:
+                modifiers.append(value)
+                self.pos += 1
+                continue
+
+            next_token = self._peek(1)
+            if value in JAVA_TYPE_KEYWORDS and next_token is not None and next_token.kind == 'ident':
+                self.pos += 2
+                declaration = JavaClass(annotations, modifiers, value, next_token.value, owner.name if owner else None, [])
+                result.classes.append(declaration)
+                while self.pos < len(self.tokens) and not self._at('{'):
+                    self.pos += 1
+                self.pos += 1
+                if value == 'enum':
+                    declaration.constants.extend(self._read_enum_constants())
+                self._scan_members(result, declaration)
+                annotations, modifiers = [], []
+                continue
+
+            if owner is None:
+                self.pos += 1
+                continue
+
+            member_type = self.read_type()
+            name_token = self._peek()
+            if self._at('('):
+                # Constructor: skip parameters and body
+                self._skip_group('(', ')')
+                self._skip_member_body()
+            elif name_token is not None and name_token.kind == 'ident':
+                self.pos += 1
+                if self._at('('):
+                    open_index = self.pos
+                    close_index = self._skip_group('(', ')')
+                    parameters = self.source[self.tokens[open_index].end:self.tokens[close_index].start]
+                    result.methods.append(JavaMethod(annotations, modifiers, member_type, name_token.value, parameters.strip(), owner.name))
+                    self._skip_member_body()
+                else:
+                    result.fields.append(JavaField(annotations, modifiers, member_type, name_token.value, owner.name))
+                    self._read_more_declarators(result, annotations, modifiers, member_type, owner)
+            else:
+                self._skip_statement()
+            annotations, modifiers = [], []
+
+    def _skip_member_body(self) -> None:
+        """Skip 'throws' clauses and a method body or trailing ';'."""
+        while self.pos < len(self.tokens):
+            if self._at('{'):
+                self._skip_group('{', '}')
+                return
+            if self._at(';'):
+                self.pos += 1
+                return
+            if self._at('}'):
+                return
+            self.pos += 1
+
+    def _read_enum_constants(self) -> List[str]:
+        """Read enum constant names up to the ';' that starts the enum's members.
+
+        Constructor arguments and constant bodies are skipped.
+        """
+        constants = []
+        depth = 0
+        expect_name = True
+        while self.pos < len(self.tokens):
+            token = self.tokens[self.pos]
+            if token.kind == 'symbol':
+                if token.value == '@' and depth == 0:
+                    self.read_annotation()
+                    continue
+                if token.value in '({':
+                    depth += 1
+                elif token.value in ')}':
+                    if depth == 0:
+                        return constants
+                    depth -= 1
+                elif token.value == ';' and depth == 0:
+                    self.pos += 1
+                    return constants
+                elif token.value == ',' and depth == 0:
+                    expect_name = True
+            elif token.kind == 'ident' and depth == 0 and expect_name:
+                constants.append(token.value)
+                expect_name = False
+            self.pos += 1
+        return constants
+
+    def _read_more_declarators(self, result: JavaSource, annotations: List[JavaAnnotation], modifiers: List[str], field_type: str, owner: JavaClass) -> None:
+        """Record further declarators of 'int a, b = 1;' and skip initializers."""
+        depth = 0
+        while self.pos < len(self.tokens):
+            token = self.tokens[self.pos]
+            self.pos += 1
+            if token.kind != 'symbol':
+                continue
+            if token.value in '({[':
+                depth += 1
+            elif token.value in ')}]':
+                if depth == 0:
+                    self.pos -= 1
+                    return
+                depth -= 1
+            elif token.value == ';' and depth == 0:
+                return
+            elif token.value == ',' and depth == 0:
+                name_token = self._peek()
+                if name_token is not None and name_token.kind == 'ident':
+                    result.fields.append(JavaField(annotations, modifiers, field_type, name_token.value, owner.name))
+
+    def read_parameter(self) -> Tuple[List[JavaAnnotation], Optional[str], Optional[str]]:
+        """Read a single method parameter: annotations, type and name."""
+        annotations = []
+        while self.pos < len(self.tokens):
+            if self._at('@'):
+                annotations.append(self.read_annotation())
+            elif self._peek().value in JAVA_MODIFIERS:
+                self.pos += 1
+            else:
+                break
+        param_type = self.read_type()
+        name_token = self._peek()
+        param_name = name_token.value if name_token is not None and name_token.kind == 'ident' else None
+        return annotations, param_type, param_name
+
+@functools.lru_cache(maxsize=4096)
+def parse_java_type(type_text: str) -> JavaType:
+    """Parse a Java type expression such as Map<String, List<Foo>>[] into a JavaType tree."""
+    return JavaLexer(type_text).parse_type()
+
+
+# Persistent parse cache shared by the Java tools
+CACHE_DIR = '.easy-scripts-cache'
+CACHE_FILE = 'java-parse-cache.sqlite3'
+# Files modified this recently are hashed even when size and mtime match: a
+# same-size edit within the timestamp granularity would otherwise go unnoticed
+RECENT_MTIME_NS = 2_000_000_000
+
+CACHE_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    source TEXT NOT NULL
+);
+'''
+
+def hash_file(path: str) -> str:
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+# Entries written by a different version of this module are discarded
+PARSER_VERSION = hash_file(os.path.abspath(__file__))
+
+def _annotations_to_data(annotations: List[JavaAnnotation]) -> List[Any]:
+    return [[annotation.name, {key: [[token.kind, token.value] for token in tokens] for key, tokens in annotation.arguments.items()}]
+            for annotation in annotations]
+
+def _annotations_from_data(data: List[Any]) -> List[JavaAnnotation]:
+    # Token offsets are not stored; annotation arguments are only read by kind and value
+    return [JavaAnnotation(name, {key: [JavaToken(kind, value, 0, 0) for kind, value in tokens] for key, tokens in arguments.items()})
+            for name, arguments in data]
+
+def source_to_data(source: JavaSource) -> Dict[str, Any]:
+    """Return the JSON-serializable form of a parsed file."""
+    return {
+        'package': source.package,
+        'classes': [[_annotations_to_data(c.annotations), c.modifiers, c.kind, c.name, c.owner, c.constants] for c in source.classes],
+        'fields': [[_annotations_to_data(f.annotations), f.modifiers, f.type, f.name, f.owner] for f in source.fields],
+        'methods': [[_annotations_to_data(m.annotations), m.modifiers, m.return_type, m.name, m.parameters, m.owner] for m in source.methods]
+    }
+
+def source_from_data(data: Dict[str, Any]) -> JavaSource:
+    source = JavaSource()
+    source.package = data['package']
+    source.classes = [JavaClass(_annotations_from_data(annotations), *rest) for annotations, *rest in data['classes']]
+    source.fields = [JavaField(_annotations_from_data(annotations), *rest) for annotations, *rest in data['fields']]
+    source.methods = [JavaMethod(_annotations_from_data(annotations), *rest) for annotations, *rest in data['methods']]
+    return source
+
+# Disabled profiler standing in for a tool's Profiler when none is given
+_NO_PROFILER = Profiler()
+
+class JavaParseCache:
+    """Parsed Java sources persisted in SQLite and shared by the Java tools.
+
+    Entries are keyed by absolute path and validated by size and mtime; a
+    file whose stat changed but whose content hash did not is not lexed
+    again. Each write is a single transaction on a WAL-mode database, so an
+    interrupted run never leaves a partial entry behind, and a database that
+    turns out to be damaged is deleted and rebuilt. The cache only holds
+    derived data and can be removed at any time.
+
+    With cache_dir None nothing is persisted and every file is parsed.
+    Instances can be sent to worker processes, each of which opens its own
+    connection; call connect() before starting them so a damaged database is
+    rebuilt once.
+    """
+    def __init__(self, cache_dir: Optional[str] = CACHE_DIR):
+        self.path = os.path.join(cache_dir, CACHE_FILE) if cache_dir else None
+        self.hits = 0
+        self.misses = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'path': self.path}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.path = state['path']
+        self.hits = self.misses = 0
+        self._connection = self._pid = None
+
+    def connect(self) -> Optional[sqlite3.Connection]:
+        """Return the connection of this process, or None when the cache is disabled."""
+        if self.path is None:
+            return None
+        if self._connection is None or self._pid != os.getpid():
+            self._pid = os.getpid()
+            try:
+                self._connection = self._open()
+            except sqlite3.OperationalError as e:
+                return self._disable(e)
+            except sqlite3.DatabaseError as e:
+                # Not a database or malformed: start over, the cache only holds derived data
+                print(f"Parse cache {self.path} is damaged, rebuilding it: {e}")
+                self.remove()
+                try:
+                    self._connection = self._open()
+                except sqlite3.Error as e:
+                    return self._disable(e)
+        return self._connection
+
+    def _disable(self, error: sqlite3.Error) -> None:
+        print(f"Parse cache disabled: {error}")
+        self.path = None
+        self._connection = None
+
+    def _open(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.executescript(CACHE_SCHEMA)
+            row = connection.execute("SELECT value FROM meta WHERE key = 'parser'").fetchone()
+            if row is None or row[0] != PARSER_VERSION:
+                connection.execute('BEGIN IMMEDIATE')
+                connection.execute('DELETE FROM files')
+                connection.execute("INSERT OR REPLACE INTO meta VALUES ('parser', ?)", (PARSER_VERSION,))
+                connection.execute('COMMIT')
+        except sqlite3.Error:
+            connection.close()
+            raise
+        return connection
+
+    def close(self) -> None:
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+    def remove(self) -> None:
+        """Delete the database files."""
+        self.close()
+        for suffix in ('', '-wal', '-shm'):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.path + suffix)
+
+    def _execute(self, sql: str, parameters: Tuple[Any, ...] = ()) -> Optional[Tuple[Any, ...]]:
+        """Run one statement and return its first row; errors turn into cache misses."""
+        connection = self.connect()
+        if connection is None:
+            return None
+        try:
+            return connection.execute(sql, parameters).fetchone()
+        except sqlite3.OperationalError:
+            # Locked beyond the timeout or read-only: carry on without the cache
+            return None
+        except sqlite3.DatabaseError as e:
+            print(f"Parse cache {self.path} is damaged, rebuilding it: {e}")
+            self.remove()
+            return None
+
+    def parse(self, path: str, markers: Iterable[bytes] = (), profiler: Optional[Profiler] = None) -> Optional[JavaSource]:
+        """Return the declarations of a Java file, from the cache when it is unchanged.
+
+        With markers, a file that is not cached and contains none of them is
+        neither decoded nor lexed, and None is returned. Raises OSError when
+        the file cannot be read.
+        """
+        profiler = profiler or _NO_PROFILER
+        path = os.path.abspath(path)
+        row = None
+        if self.connect() is not None:
+            stat = os.stat(path)
+            row = self._execute('SELECT size, mtime_ns, content_hash, source FROM files WHERE path = ?', (path,))
+            if row and row[:2] == (stat.st_size, stat.st_mtime_ns) and time.time_ns() - stat.st_mtime_ns > RECENT_MTIME_NS:
+                self.hits += 1
+                return source_from_data(json.loads(row[3]))
+
+        with profiler.span('read', path=path):
+            with open(path, 'rb') as file:
+                data = file.read()
+            profiler.count('bytes_read', len(data))
+        content_hash = hashlib.sha256(data).hexdigest() if self.path else None
+        if row and row[2] == content_hash:
+            self.hits += 1
+            self._execute('UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?', (stat.st_size, stat.st_mtime_ns, path))
+            return source_from_data(json.loads(row[3]))
+        if markers and not any(marker in data for marker in markers):
+            return None
+
+        self.misses += 1
+        # Named apart from the tools' own 'parse' stages, so stage totals do not mix lexing into them
+        with profiler.span('lex', path=path):
+            source = JavaLexer(data.decode('utf-8', errors='replace')).scan()
+        if self.path:
+            self._execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)',
+                          (path, stat.st_size, stat.st_mtime_ns, content_hash, json.dumps(source_to_data(source), separators=(',', ':'))))
+        return source
+
+    def invalidate(self, paths: Iterable[str] = ()) -> int:
+        """Drop the entries of the given files and directories, or every entry; return how many."""
+        connection = self.connect()
+        if connection is None:
+            return 0
+        paths = [os.path.abspath(path) for path in paths]
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            if paths:
+                removed = 0
+                for path in paths:
+                    prefix = os.path.join(path, '')
+                    removed += connection.execute('DELETE FROM files WHERE path = ? OR substr(path, 1, ?) = ?',
+                                                  (path, len(prefix), prefix)).rowcount
+            else:
+                removed = connection.execute('DELETE FROM files').rowcount
+            connection.execute('COMMIT')
+        except sqlite3.Error:
+            connection.execute('ROLLBACK')
+            raise
+        if not paths:
+            connection.execute('VACUUM')
+        return removed
+
+    def prune(self) -> int:
+        """Drop the entries of files that no longer exist; return how many."""
+        connection = self.connect()
+        if connection is None:
+            return 0
+        missing = [(path,) for path, in connection.execute('SELECT path FROM files') if not os.path.exists(path)]
+        connection.execute('BEGIN IMMEDIATE')
+        connection.executemany('DELETE FROM files WHERE path = ?', missing)
+        connection.execute('COMMIT')
+        return len(missing)
+
+    def stats(self) -> Dict[str, int]:
+        connection = self.connect()
+        entries = connection.execute('SELECT COUNT(*) FROM files').fetchone()[0] if connection else 0
+        size = sum(os.path.getsize(self.path + suffix) for suffix in ('', '-wal') if os.path.exists(self.path + suffix)) if self.path else 0
+        return {'entries': entries, 'bytes': size}
+
+def add_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the --cache-dir and --no-cache options shared by the Java tools."""
+    parser.add_argument("--cache-dir", default=CACHE_DIR,
+                        help=f"Directory of the shared Java parse cache (default: {CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="Parse every Java file without the parse cache")
+
+def cache_from_arguments(args: argparse.Namespace) -> JavaParseCache:
+    return JavaParseCache(None if args.no_cache else args.cache_dir)
+
+def cli(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog=prog, description="Inspect or invalidate the Java parse cache shared by the Java tools.")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help=f"Directory of the parse cache (default: {CACHE_DIR})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Show the number of cached files and the size of the cache")
+    invalidate = commands.add_parser("invalidate", help="Drop cached entries so the files are parsed again")
+    invalidate.add_argument("paths", nargs="*", help="Files or directories to invalidate (default: everything)")
+    commands.add_parser("prune", help="Drop the entries of files that no longer exist")
+    args = parser.parse_args(argv)
+
+    cache = JavaParseCache(args.cache_dir)
+    if not os.path.exists(cache.path):
+        print(f"No parse cache at {cache.path}")
+        return 0
+    if args.command == "stats":
+        stats = cache.stats()
+        print(f"{cache.path}: {stats['entries']} files, {stats['bytes'] / 1024 / 1024:.1f} MiB")
+    elif args.command == "invalidate":
+        print(f"{cache.invalidate(args.paths)} entries invalidated.")
+    else:
+        print(f"{cache.prune()} entries of deleted files removed.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(cli())
@@ -0,0 +1,199 @@
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import contextlib
+from typing import Dict, List, Any, Optional
+
+from openApiGenerator import build_generator, find_controllers, process_directory, split_parameters
+
+FIELD_TYPES = [
+    'String', 'Integer', 'Long', 'Boolean', 'BigDecimal', 'UUID', 'LocalDate', 'LocalDateTime',
+    'List<String>', 'Set<UUID>', 'Map<String, Long>', 'Map<String, List<Optional<Integer>>>'
+]
+
+ENDPOINT_TEMPLATES = [
+    ('GetMapping', '"/all"', 'getAll{entity}s', '', 'ResponseEntity<GlobalResponseMessage<List<{entity}Response>>>'),
+    ('GetMapping', '"/{{id}}"', 'get{entity}ById', '@PathVariable("id") UUID id', 'ResponseEntity<GlobalResponseMessage<{entity}Response>>'),
+    ('PostMapping', '', 'create{entity}', '@RequestBody {entity}Request request', 'ResponseEntity<GlobalResponseMessage<{entity}Response>>'),
+    ('PutMapping', '"/{{id}}"', 'update{entity}', '@PathVariable UUID id, @RequestBody {entity}Request request', 'GlobalResponseMessage<{entity}Response>'),
+    ('DeleteMapping', '"/{{id}}"', 'delete{entity}', '@PathVariable UUID id', 'GlobalResponseMessage<Boolean>'),
+    ('GetMapping', '"/search{n}"', 'search{entity}{n}', '@RequestParam(value = "q", required = false) String q, @RequestParam Integer page, @RequestParam Map<String, List<String>> filters',
+     'ResponseEntity<Page<{entity}Response>>'),
+    ('GetMapping', '"/report{n}"', 'report{entity}{n}', '@RequestParam(name = "from") LocalDate from, @RequestParam(name = "to") LocalDate to',
+     'ResponseEntity<GlobalResponseMessage<Map<String, List<Optional<{entity}Response>>>>>'),
+]
+
+def generate_project(root_dir: str, controllers: int, endpoints: int, fields: int, large_every: int, seed: int) -> None:
+    """Write a deterministic synthetic Spring Boot source tree under root_dir."""
+    rng = random.Random(seed)
+    for index in range(controllers):
+        entity = f"Entity{index}"
+        package = f"com.example.module{index % 25}"
+        package_dir = os.path.join(root_dir, *package.split('.'))
+        os.makedirs(package_dir, exist_ok=True)
+
+        # Every large_every-th controller is ten times bigger
+        count = endpoints * 10 if large_every and index % large_every == large_every - 1 else endpoints
+        methods = []
+        for n in range(count):
+            mapping, path, name, parameters, return_type = ENDPOINT_TEMPLATES[n % len(ENDPOINT_TEMPLATES)]
+            if n >= len(ENDPOINT_TEMPLATES):
+                mapping, path, name = 'GetMapping', '"/op{n}/{{id}}"', 'operation{n}'
+            path, name, parameters, return_type = (
+                part.format(entity=entity, n=n) for part in (path, name, parameters, return_type)
+            )
+            methods.append(f'''
+    /**
+     * Generated endpoint {n} with a "string (with parens)" in its javadoc.
+     */
+    @{mapping}{f"({path})" if path else ""}
+    public {return_type} {name}({parameters}) {{
+        if (service.count() > {n}) {{ return null; }}
+        return service.call("{{}}", () -> {{ return null; }});
+    }}
+''')
+        with open(os.path.join(package_dir, f"{entity}Controller.java"), 'w') as file:
+            file.write(f'''package {package};
+
+import org.springframework.web.bind.annotation.*;
+
+@RestController
+@RequestMapping("/api/{entity.lower()}")
+public class {entity}Controller {{
+    private final {entity}Service service;
+{"".join(methods)}}}
+''')
+        for suffix in ('Request', 'Response'):
+            declarations = '\n'.join(
+                f"    @JsonProperty(\"f{i}\")\n    private {rng.choice(FIELD_TYPES)} field{i};" for i in range(fields)
+            )
+            with open(os.path.join(package_dir, f"{entity}{suffix}.java"), 'w') as file:
+                file.write(f"package {package};\n\n@Data\npublic class {entity}{suffix} {{\n{declarations}\n}}\n")
+
+def time_stages(root_dir: str) -> Dict[str, float]:
+    """Run the generation pipeline stage by stage and return seconds per stage."""
+    generator = build_generator()
+    stages = dict.fromkeys(['read', 'parse_controller', 'detect_missing_endpoints', 'parameter_parsing', 'parse_dto', 'yaml_emit'], 0.0)
+    for controller_path, request_path, response_path, _ in find_controllers(root_dir):
+        start = time.perf_counter()
+        with open(controller_path, 'r') as file:
+            controller_content = file.read()
+        dto_contents = []
+        for path in (request_path, response_path):
+            if os.path.exists(path):
+                with open(path, 'r') as file:
+                    dto_contents.append(file.read())
+        stages['read'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        class_name, _, endpoints = generator.controller_parser.parse_controller(controller_content, generator.classifier)
+        stages['parse_controller'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        endpoints = generator.endpoint_detector.detect_missing_endpoints(endpoints, class_name.replace('Controller', ''))
+        stages['detect_missing_endpoints'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for endpoint in endpoints:
+            for param in split_parameters(endpoint['parameters']):
+                generator.parameter_parser.parse(param)
+        stages['parameter_parsing'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for content in dto_contents:
+            generator.java_class_parser.parse_file(content)
+        stages['parse_dto'] += time.perf_counter() - start
+
+        document = generator.build_openapi_document(controller_path, request_path, response_path)
+        start = time.perf_counter()
+        generator.contract_writer.write(document, io.StringIO())
+        stages['yaml_emit'] += time.perf_counter() - start
+    return stages
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as work_dir:
+        root_dir = os.path.join(work_dir, 'src', 'main', 'java')
+        start = time.perf_counter()
+        generate_project(root_dir, args.controllers, args.endpoints, args.fields, args.large_every, args.seed)
+        print(f"Generated project in {time.perf_counter() - start:.2f}s")
+
+        end_to_end = []
+        stage_runs = []
+        for _ in range(args.repeat):
+            output_dir = os.path.join(work_dir, 'api_contracts')
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                failures = process_directory(root_dir, jobs=args.jobs, output_dir=output_dir, incremental=False)
+            end_to_end.append(time.perf_counter() - start)
+            if failures:
+                raise RuntimeError(f"{len(failures)} controllers failed, first: {failures[0]}")
+            stage_runs.append(time_stages(root_dir))
+
+    # Best of N is the least noisy estimate of the achievable time
+    metrics = {'end_to_end': min(end_to_end)}
+    for stage in stage_runs[0]:
+        metrics[stage] = min(run[stage] for run in stage_runs)
+    return {
+        'config': {key: getattr(args, key) for key in ('controllers', 'endpoints', 'fields', 'large_every', 'seed', 'jobs', 'repeat')},
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'metrics': metrics
+    }
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Return the metrics that are slower than the baseline by more than threshold."""
+    if baseline.get('config') != results['config']:
+        print("WARNING: baseline was recorded with a different configuration")
+    regressions = []
+    for metric, seconds in results['metrics'].items():
+        previous = baseline.get('metrics', {}).get(metric)
+        if not previous:
+            continue
+        change = (seconds - previous) / previous
+        marker = ' REGRESSION' if change > threshold else ''
+        print(f"{metric:<26} {previous:9.4f}s -> {seconds:9.4f}s  {change:+7.1%}{marker}")
+        if change > threshold:
+            regressions.append(metric)
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark openApiGenerator on a synthetic Spring Boot project.")
+    parser.add_argument("--controllers", type=int, default=200, help="Number of controllers (default: 200)")
+    parser.add_argument("--endpoints", type=int, default=12, help="Endpoints per controller (default: 12)")
+    parser.add_argument("--fields", type=int, default=25, help="Fields per Request/Response DTO (default: 25)")
+    parser.add_argument("--large-every", type=int, default=20, help="Make every Nth controller 10x larger, 0 to disable (default: 20)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed of the generated project (default: 1)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Worker processes for the end-to-end run (default: 1)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement, the best is kept (default: 3)")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against a previously written results file")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown against the baseline (default: 0.15)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args)
+    for metric, seconds in results['metrics'].items():
+        print(f"{metric:<26} {seconds:9.4f}s")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+        print("No regressions.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
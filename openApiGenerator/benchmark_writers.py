@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from typing import Dict, List, Any
+
+from openApiGenerator import YamlContractWriter, JsonContractWriter, ContractWriter, global_response_schema
+
+# Summaries with non-ASCII characters, characters that need escaping and long
+# lines, where the YAML emitters are most likely to disagree
+SUMMARY_WORDS = ["kullanıcı", "güncelle", "sipariş", "Çözüm", "naïve", "日本語", "😀", "tab\tseparated",
+                 "\"quoted\"", "it's", "back\\slash", "bell\a", "key: value", "# hash", "- dash", "line\nbreak"]
+
+def generate_document(index: int, endpoints: int, fields: int, rng: random.Random) -> Dict[str, Any]:
+    """Generate a synthetic controller document shaped like the generator's output."""
+    entity = f"Entity{index}"
+    field_types = [{"type": "string"}, {"type": "integer"}, {"type": "number"}, {"type": "boolean"},
+                   {"type": "string", "format": "date-time"}]
+    schemas = {"GlobalResponseMessage": global_response_schema()}
+    for suffix in ("Request", "Response"):
+        schemas[f"{entity}{suffix}"] = {
+            "type": "object",
+            "properties": {f"field{i}": dict(rng.choice(field_types)) for i in range(fields)}
+        }
+    paths = {}
+    for i in range(endpoints):
+        paths[f"/api/{entity.lower()}/op{i}/{{id}}"] = {
+            rng.choice(["get", "post", "put", "delete"]): {
+                "summary": f"operation{i}",
+                "description": " ".join(rng.choice(SUMMARY_WORDS) for _ in range(rng.randint(1, 40))),
+                "parameters": [{"name": "id", "in": "path", "required": True, "schema": {"type": "string"}}],
+                "responses": {
+                    "200": {
+                        "description": "Successful operation",
+                        "content": {"application/json": {"schema": {"$ref": f"#/components/schemas/{entity}Response"}}}
+                    }
+                }
+            }
+        }
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": f"{entity} API", "version": "1.0.0", "description": f"API for {entity} operations"},
+        "paths": paths,
+        "components": {"schemas": schemas}
+    }
+
+def time_writer(writer: ContractWriter, corpus: List[Dict[str, Any]], output_dir: str) -> float:
+    start = time.perf_counter()
+    for index, document in enumerate(corpus):
+        writer.write_file(document, os.path.join(output_dir, f"doc{index}{writer.extension}"))
+    return time.perf_counter() - start
+
+def read_outputs(output_dir: str) -> Dict[str, bytes]:
+    outputs = {}
+    for name in os.listdir(output_dir):
+        with open(os.path.join(output_dir, name), "rb") as file:
+            outputs[name] = file.read()
+    return outputs
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare contract writer backends on a generated corpus.")
+    parser.add_argument("--documents", type=int, default=200, help="Number of documents (default: 200)")
+    parser.add_argument("--endpoints", type=int, default=20, help="Endpoints per document (default: 20)")
+    parser.add_argument("--fields", type=int, default=30, help="Fields per DTO schema (default: 30)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [generate_document(i, args.endpoints, args.fields, rng) for i in range(args.documents)]
+
+    backends = [("yaml (pure Python)", YamlContractWriter(use_libyaml=False))]
+    if YamlContractWriter().dumper is not backends[0][1].dumper:
+        backends.append(("yaml (libyaml CDumper)", YamlContractWriter(use_libyaml=True)))
+    else:
+        print("libyaml not available, skipping CDumper backend")
+    backends.append(("json", JsonContractWriter()))
+
+    print(f"Corpus: {args.documents} documents, {args.endpoints} endpoints, {args.fields} fields per schema")
+    yaml_outputs = []
+    baseline = None
+    for name, writer in backends:
+        with tempfile.TemporaryDirectory() as output_dir:
+            elapsed = time_writer(writer, corpus, output_dir)
+            outputs = read_outputs(output_dir)
+        size = sum(len(data) for data in outputs.values())
+        if writer.extension == ".yaml":
+            yaml_outputs.append((name, outputs))
+        baseline = baseline or elapsed
+        print(f"{name:<24} {elapsed:8.3f}s  {baseline / elapsed:5.1f}x  {size / 1024:10.0f} KiB")
+
+    # Every document must be byte-identical across the YAML backends, since the manifest hashes them
+    status = 0
+    reference_name, reference = yaml_outputs[0]
+    for name, outputs in yaml_outputs[1:]:
+        different = sorted(document for document in reference if outputs.get(document) != reference[document])
+        if different:
+            print(f"ERROR: {name} differs from {reference_name} in {len(different)} documents, e.g. {different[0]}")
+            status = 1
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,127 @@
 import os
-import yaml
+import sys
 import re
 import abc
-from typing import Dict, List, Tuple, Any, Set, Optional
+import json
+import hashlib
+import functools
+import copy
+import threading
+import time
+import argparse
+import multiprocessing
+from typing import Dict, List, Tuple, Any, Set, Optional, Iterable, Iterator, NamedTuple, IO
+
+# The Java lexer and its on-disk parse cache are shared with the other Java tools
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'javaParseCache'))
+from javaParseCache import (JavaClass, JavaSource, JavaType, JavaLexer, JavaParseCache, parse_java_type, split_generic_type,
+                            split_parameters, add_cache_arguments, cache_from_arguments, PARSER_VERSION)
+# Directory walker honoring .gitignore, shared by every script
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'sourceWalker'))
+from sourceWalker import SourceWalker, add_walk_arguments, walker_from_arguments
+# Stage profiler behind --profile, shared with the other tools
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'stageProfiler'))
+from stageProfiler import Profiler
+
+# Java type expressions and their OpenAPI schemas.
+# Scalar mappings shared by the type converter and the return type handler.
+JAVA_SCALAR_TYPES = {
+    'string': {'type': 'string'},
+    'String': {'type': 'string'},
+    'integer': {'type': 'integer'},
+    'Integer': {'type': 'integer'},
+    'int': {'type': 'integer'},
+    'long': {'type': 'integer'},
+    'Long': {'type': 'integer'},
+    'Short': {'type': 'integer'},
+    'short': {'type': 'integer'},
+    'number': {'type': 'number'},
+    'Double': {'type': 'number'},
+    'Float': {'type': 'number'},
+    'double': {'type': 'number'},
+    'float': {'type': 'number'},
+    'Boolean': {'type': 'boolean'},
+    'boolean': {'type': 'boolean'},
+    'ZonedDateTime': {'type': 'string', 'format': 'date-time'},
+    'LocalDateTime': {'type': 'string', 'format': 'date-time'},
+    'LocalDate': {'type': 'string', 'format': 'date'},
+    'Date': {'type': 'string', 'format': 'date-time'},
+    'UUID': {'type': 'string'},
+    'BigDecimal': {'type': 'number'},
+    'object': {'type': 'object'},
+    'Object': {'type': 'object'},
+    'void': {'type': 'object'},
+    'Void': {'type': 'object'}
+}
+
+class TypeSchemaResolver:
+    """Maps Java type expressions to OpenAPI schemas.
+
+    Results are memoized per type in an LRU cache, so a type that recurs
+    across thousands of fields and endpoints is converted once. Use
+    cache_info() to inspect hits and misses.
+    """
+    collection_types = {'List', 'ArrayList', 'LinkedList', 'Set', 'HashSet', 'LinkedHashSet', 'TreeSet',
+                        'SortedSet', 'Collection', 'Iterable'}
+    map_types = {'Map', 'HashMap', 'LinkedHashMap', 'TreeMap', 'SortedMap', 'ConcurrentHashMap'}
+    wrapper_types = {'Optional', 'ResponseEntity'}
+
+    def __init__(self, scalar_types: Optional[Dict[str, Dict[str, Any]]] = None, maxsize: int = 4096):
+        self.scalar_types = JAVA_SCALAR_TYPES if scalar_types is None else scalar_types
+        self._resolve_type = functools.lru_cache(maxsize=maxsize)(self.build_schema)
+
+    def resolve(self, type_text: str) -> Dict[str, Any]:
+        """Return the schema of a type string."""
+        return self.resolve_type(parse_java_type(type_text.strip()))
+
+    def resolve_type(self, java_type: JavaType) -> Dict[str, Any]:
+        """Return the schema of a parsed type; callers get their own copy."""
+        return copy.deepcopy(self._resolve_type(java_type))
+
+    def cache_info(self):
+        return self._resolve_type.cache_info()
+
+    def build_schema(self, java_type: JavaType) -> Dict[str, Any]:
+        name, arguments = java_type.name, java_type.arguments
+        if java_type.array_depth:
+            if java_type.array_depth == 1 and name in ('byte', 'Byte'):
+                return {'type': 'string', 'format': 'byte'}
+            return {'type': 'array', 'items': self.build_schema(java_type._replace(array_depth=java_type.array_depth - 1))}
+        if name == '?':
+            if arguments and java_type.bound == 'extends':
+                return self.build_schema(arguments[0])
+            return {'type': 'object'}
+        if name in self.scalar_types:
+            return dict(self.scalar_types[name])
+        if name in self.collection_types:
+            return {'type': 'array', 'items': self.build_schema(arguments[0]) if arguments else {'type': 'object'}}
+        if name in self.map_types:
+            if len(arguments) == 2:
+                return {'type': 'object', 'additionalProperties': self.build_schema(arguments[1])}
+            return {'type': 'object'}
+        if name in self.wrapper_types:
+            return self.build_schema(arguments[0]) if arguments else {'type': 'object'}
+        if name == 'Page':
+            return {
+                "type": "object",
+                "properties": {
+                    "content": {
+                        "type": "array",
+                        "items": self.build_schema(arguments[0]) if arguments else {'type': 'object'}
+                    },
+                    "pageable": {"type": "object"},
+                    "totalElements": {"type": "integer"},
+                    "totalPages": {"type": "integer"},
+                    "last": {"type": "boolean"},
+                    "size": {"type": "integer"},
+                    "number": {"type": "integer"},
+                    "sort": {"type": "object"},
+                    "numberOfElements": {"type": "integer"},
+                    "first": {"type": "boolean"},
+                    "empty": {"type": "boolean"}
+                }
+            }
+        return {"$ref": f"#/components/schemas/{name}"}
 
 # Endpoint classifier strategy interface
 class EndpointClassifierStrategy(abc.ABC):
@@ -118,37 +237,14 @@ class JavaTypeConverter(abc.ABC):
 
 # Concrete Java type converter
 class StandardJavaTypeConverter(JavaTypeConverter):
-    def __init__(self):
+    def __init__(self, resolver: Optional[TypeSchemaResolver] = None):
         # Define type mappings
-        self.type_mapping = {
-            'string': {'type': 'string'},
-            'String': {'type': 'string'},
-            'integer': {'type': 'integer'},
-            'Integer': {'type': 'integer'},
-            'int': {'type': 'integer'},
-            'long': {'type': 'integer'},
-            'Long': {'type': 'integer'},
-            'Double': {'type': 'number'},
-            'Float': {'type': 'number'},
-            'double': {'type': 'number'},
-            'float': {'type': 'number'},
-            'Boolean': {'type': 'boolean'},
-            'boolean': {'type': 'boolean'},
-            'ZonedDateTime': {'type': 'string', 'format': 'date-time'},
-            'LocalDateTime': {'type': 'string', 'format': 'date-time'},
-            'LocalDate': {'type': 'string', 'format': 'date'},
-            'Date': {'type': 'string', 'format': 'date-time'},
-            'UUID': {'type': 'string'},
-            'BigDecimal': {'type': 'number'}
-        }
+        self.type_mapping = dict(JAVA_SCALAR_TYPES)
+        self.resolver = resolver or TypeSchemaResolver(self.type_mapping)
     
     def to_openapi_type(self, java_type: str) -> Dict[str, Any]:
         """Convert Java type to OpenAPI type."""
-        # Check if it's a boolean reference
-        if java_type == 'boolean':
-            return {'type': 'boolean'}
-        
-        return self.type_mapping.get(java_type, {"$ref": f"#/components/schemas/{java_type}"})
+        return self.resolver.resolve(java_type)
 
 # Parameter parser interface
 class ParameterParser(abc.ABC):
@@ -157,67 +253,29 @@ class ParameterParser(abc.ABC):
         """Parse a parameter string and extract type, name, and schema."""
         pass
 
-# Concrete parameter parser using regex
-class RegexParameterParser(ParameterParser):
+# Concrete parameter parser built on the Java lexer
+class StandardParameterParser(ParameterParser):
+    # Annotation -> OpenAPI parameter location
+    locations = {'PathVariable': 'path', 'RequestParam': 'query', 'RequestBody': 'body'}
+    
     def parse(self, param: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
-        """Parse a parameter string using regex patterns."""
+        """Parse a parameter string such as '@PathVariable("id") UUID id'."""
         param = param.strip()
         if not param:
             return None, None, None
         
+        annotations, java_type, param_name = JavaLexer(param).read_parameter()
+        java_type = java_type or 'String'  # Default type
+        
         # Initialize default parameter type
         param_type = 'query'
-        
-        # Extract Java type and parameter name using more robust patterns
-        java_type = 'String'  # Default type
-        param_name = None
-        
-        # Handle @PathVariable annotation
-        if '@PathVariable' in param:
-            param_type = 'path'
-            # Try to extract parameter name and type with regex
-            match = re.search(r'@PathVariable(?:\(.*?\))?\s+(?:final\s+)?([\w<>\[\],.]+)\s+([\w]+)', param)
-            if match:
-                java_type = match.group(1)
-                param_name = match.group(2)
-            else:
-                # Try simpler pattern for just the name
-                match = re.search(r'@PathVariable(?:\(.*?\))?\s+([\w]+)', param)
-                if match:
-                    param_name = match.group(1)
-                else:
-                    # Try to extract from @PathVariable("name")
-                    match = re.search(r'@PathVariable\("([^"]+)"\)', param)
-                    if match:
-                        param_name = match.group(1)
-        
-        # Handle @RequestParam annotation
-        elif '@RequestParam' in param:
-            param_type = 'query'
-            # Try to extract parameter name and type with regex
-            match = re.search(r'@RequestParam(?:\(.*?\))?\s+(?:final\s+)?([\w<>\[\],.]+)\s+([\w]+)', param)
-            if match:
-                java_type = match.group(1)
-                param_name = match.group(2)
-            else:
-                # Try simpler pattern for just the name
-                match = re.search(r'@RequestParam(?:\(.*?\))?\s+([\w]+)', param)
-                if match:
-                    param_name = match.group(1)
-                else:
-                    # Try to extract from @RequestParam("name")
-                    match = re.search(r'@RequestParam\("([^"]+)"\)', param)
-                    if match:
-                        param_name = match.group(1)
-        
-        # Handle @RequestBody annotation
-        elif '@RequestBody' in param:
-            param_type = 'body'
-            # Try to extract parameter name and type with regex
-            match = re.search(r'@RequestBody(?:\(.*?\))?\s+(?:final\s+)?([\w<>\[\],.]+)\s+([\w]+)', param)
-            if match:
-                java_type = match.group(1)
-                param_name = match.group(2)
+        for annotation in annotations:
+            if annotation.name in self.locations:
+                param_type = self.locations[annotation.name]
+                # An explicit name in the annotation wins over the Java variable name
+                if param_type != 'body':
+                    param_name = annotation.string('value', 'name') or param_name
+                break
         
         # If we couldn't extract a parameter name, use the last word in the parameter string
         if not param_name:
@@ -244,25 +302,36 @@ class RegexParameterParser(ParameterParser):
         
         return param_type, param_name, param_type_schema
 
+# Former name of the parameter parser, kept for code building the generator with its own strategies
+RegexParameterParser = StandardParameterParser
+
 # Java class parser interface
 class JavaClassParser(abc.ABC):
     @abc.abstractmethod
     def parse_file(self, file_content: str) -> Tuple[str, Dict[str, str]]:
         """Parse a Java class file and extract class name and properties."""
         pass
+    
+    def parse_source(self, source: JavaSource) -> Tuple[str, Dict[str, str]]:
+        """Extract class name and properties from an already lexed file. Parsers that only implement parse_file get the file text instead."""
+        raise NotImplementedError
 
 # Concrete Java class parser
 class StandardJavaClassParser(JavaClassParser):
     def parse_file(self, file_content: str) -> Tuple[str, Dict[str, str]]:
-        """Parse a Java class file using regex patterns."""
-        class_name = re.search(r'class (\w+)', file_content).group(1)
-        # Updated regex to capture the full type, including generics and annotations
-        properties = re.findall(r'(?:@[^\n]+\s+)*private\s+([\w<>,\s\[\]]+)\s+(\w+)(?:\s*=\s*[^;]+)?;', file_content)
+        """Parse a Java class file using the Java lexer."""
+        return self.parse_source(JavaLexer(file_content).scan())
+    
+    def parse_source(self, source: JavaSource) -> Tuple[str, Dict[str, str]]:
+        if not source.classes:
+            raise ValueError("No class declaration found")
+        class_name = source.classes[0].name
         
         property_dict = {}
-        for type_name, prop_name in properties:
+        for field in source.instance_fields(class_name):
+            prop_name = field.name
             # Normalize types to ensure consistent handling
-            normalized_type = type_name.strip()
+            normalized_type = field.type
             
             # Handle date types with proper format
             if normalized_type in ['LocalDate']:
@@ -284,23 +353,7 @@ class StandardJavaClassParser(JavaClassParser):
             # Handle boolean types
             elif normalized_type in ['Boolean', 'boolean']:
                 property_dict[prop_name] = 'boolean'
-            # Handle collection types
-            elif 'List<' in normalized_type or 'Set<' in normalized_type or 'Collection<' in normalized_type:
-                # Extract the generic type
-                generic_type = re.search(r'<([^>]+)>', normalized_type)
-                if generic_type:
-                    inner_type = generic_type.group(1).strip()
-                    property_dict[prop_name] = f'List<{inner_type}>'
-                else:
-                    property_dict[prop_name] = 'array'
-            # Handle map types
-            elif 'Map<' in normalized_type:
-                property_dict[prop_name] = 'object'
-            # Handle arrays
-            elif '[]' in normalized_type:
-                base_type = normalized_type.replace('[]', '')
-                property_dict[prop_name] = f'List<{base_type}>'
-            # Default case
+            # Collections, maps, arrays and other classes are resolved by the type converter
             else:
                 property_dict[prop_name] = normalized_type
         
@@ -312,33 +365,57 @@ class JavaControllerParser(abc.ABC):
     def parse_controller(self, file_content: str, classifier: EndpointClassifierStrategy) -> Tuple[str, str, List[Dict[str, Any]]]:
         """Parse a Java controller file and extract endpoints."""
         pass
+    
+    def parse_source(self, source: JavaSource, classifier: EndpointClassifierStrategy) -> Tuple[str, str, List[Dict[str, Any]]]:
+        """Extract the endpoints of an already lexed controller file. Parsers that only implement parse_controller get the file text instead."""
+        raise NotImplementedError
+
+def parses_sources(parser: Any, text_method: str) -> bool:
+    """
+    Tell whether a parser is to be given lexed files: parse_source has to be
+    overridden at least as far down the class hierarchy as the text-based
+    method, so a subclass overriding only parse_file or parse_controller keeps
+    being called with the file text.
+    """
+    def defined_at(name: str) -> int:
+        return next(i for i, cls in enumerate(type(parser).__mro__) if name in vars(cls))
+    return defined_at('parse_source') <= defined_at(text_method)
 
 # Concrete Java controller parser
 class StandardJavaControllerParser(JavaControllerParser):
     def parse_controller(self, file_content: str, classifier: EndpointClassifierStrategy) -> Tuple[str, str, List[Dict[str, Any]]]:
-        """Parse a Java controller file using regex patterns."""
-        class_name = re.search(r'class (\w+)', file_content).group(1)
-        base_path_match = re.search(r'@RequestMapping(?:\(value\s*=\s*)?\(?"(.+?)"\)?', file_content)
-        base_path = base_path_match.group(1) if base_path_match else ''
-        
-        # Extract entity name from controller name (e.g., ContactController -> Contact)
-        entity_name = class_name.replace('Controller', '')
+        """Parse a Java controller file using the Java lexer."""
+        return self.parse_source(JavaLexer(file_content).scan(), classifier)
+    
+    def parse_source(self, source: JavaSource, classifier: EndpointClassifierStrategy) -> Tuple[str, str, List[Dict[str, Any]]]:
+        if not source.classes:
+            raise ValueError("No class declaration found")
+        controller = source.classes[0]
+        class_name = controller.name
+        base_mapping = source.find_annotation(controller.annotations, 'RequestMapping')
+        base_path = (base_mapping.string('value', 'path') if base_mapping else None) or ''
         
         endpoints = []
-        # Improved regex to capture more mapping patterns including method attributes
-        for method in re.finditer(r'@(\w+Mapping)(?:\((?:value\s*=\s*)?"(.+?)"(?:,\s*method\s*=\s*RequestMethod\.([A-Z]+))?\))?\s+(?:@[^\n]+\s+)*public\s+(?:ResponseEntity<)?([^>]+?)(?:>)?\s+(\w+)\(([^)]*)\)', file_content, re.DOTALL):
-            http_method = method.group(1).replace('Mapping', '').lower()
-            if http_method == 'request':
-                continue  # Skip @RequestMapping annotations
+        for method in source.methods:
+            if method.owner != class_name:
+                continue
+            mapping = next((annotation for annotation in method.annotations if annotation.name.endswith('Mapping')), None)
+            if mapping is None:
+                continue
             
+            http_method = mapping.name.replace('Mapping', '').lower()
             # If method is specified in the annotation, use that instead
-            if method.group(3):
-                http_method = method.group(3).lower()
+            if mapping.identifier('method'):
+                http_method = mapping.identifier('method').lower()
+            elif http_method == 'request':
+                continue  # Skip @RequestMapping without an explicit method
             
-            path = method.group(2) or ''
-            return_type = method.group(4).strip()
-            method_name = method.group(5)
-            parameters = method.group(6)
+            path = mapping.string('value', 'path') or ''
+            return_type = method.return_type
+            base_type, type_arguments = split_generic_type(return_type)
+            if base_type == 'ResponseEntity' and type_arguments:
+                return_type = type_arguments[0]
+            method_name = method.name
             
             # Get endpoint classification
             endpoint_info = classifier.classify(method_name, http_method)
@@ -348,7 +425,7 @@ class StandardJavaControllerParser(JavaControllerParser):
                 'method': http_method,
                 'path': path,
                 'name': method_name,
-                'parameters': parameters,
+                'parameters': method.parameters,
                 'return_type': return_type,
                 **endpoint_info  # Unpack the endpoint info dictionary
             }
@@ -366,89 +443,301 @@ class ReturnTypeHandler(abc.ABC):
 
 # Concrete return type handler
 class StandardReturnTypeHandler(ReturnTypeHandler):
+    def __init__(self, resolver: Optional[TypeSchemaResolver] = None):
+        self.resolver = resolver or TypeSchemaResolver()
+    
     def handle_return_type(self, return_type: str, openapi: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle a return type using regex patterns."""
-        # Default schema
-        return_schema = {"type": "object"}
+        """Handle a return type, resolving nested generic arguments."""
+        java_type = parse_java_type(return_type)
+        if java_type.name == "ResponseEntity" and java_type.arguments:
+            java_type = java_type.arguments[0]
         
         # Handle GlobalResponseMessage
-        if "GlobalResponseMessage" in return_type:
-            return_schema = {"$ref": "#/components/schemas/GlobalResponseMessage"}
-            
-            # Check if it contains a generic type
-            generic_match = re.search(r'GlobalResponseMessage<([^>]+)>', return_type)
-            if generic_match:
-                inner_type = generic_match.group(1).strip()
-                
-                # Handle collections inside GlobalResponseMessage
-                if "List<" in inner_type or "ArrayList<" in inner_type or "Set<" in inner_type:
-                    collection_match = re.search(r'(?:List|ArrayList|Set)<([^>]+)>', inner_type)
-                    if collection_match:
-                        collection_inner_type = collection_match.group(1).strip()
-                        # Add data schema for the collection
-                        openapi["components"]["schemas"]["GlobalResponseMessage"]["properties"]["data"] = {
-                            "type": "array",
-                            "items": {"$ref": f"#/components/schemas/{collection_inner_type}"}
-                        }
-                else:
-                    # Add data schema for the single object
-                    openapi["components"]["schemas"]["GlobalResponseMessage"]["properties"]["data"] = {
-                        "$ref": f"#/components/schemas/{inner_type}"
-                    }
-        
-        # Handle direct collection returns
-        elif "List<" in return_type or "ArrayList<" in return_type or "Set<" in return_type:
-            collection_match = re.search(r'(?:List|ArrayList|Set)<([^>]+)>', return_type)
-            if collection_match:
-                inner_type = collection_match.group(1).strip()
-                return_schema = {
-                    "type": "array",
-                    "items": {"$ref": f"#/components/schemas/{inner_type}"}
-                }
+        if java_type.name == "GlobalResponseMessage" and not java_type.array_depth:
+            if java_type.arguments:
+                # Add data schema for the wrapped type
+                openapi["components"]["schemas"]["GlobalResponseMessage"]["properties"]["data"] = self.resolver.resolve_type(java_type.arguments[0])
+            return {"$ref": "#/components/schemas/GlobalResponseMessage"}
         
-        # Handle Page returns
-        elif "Page<" in return_type:
-            page_match = re.search(r'Page<([^>]+)>', return_type)
-            if page_match:
-                inner_type = page_match.group(1).strip()
-                return_schema = {
-                    "type": "object",
-                    "properties": {
-                        "content": {
-                            "type": "array",
-                            "items": {"$ref": f"#/components/schemas/{inner_type}"}
-                        },
-                        "pageable": {"type": "object"},
-                        "totalElements": {"type": "integer"},
-                        "totalPages": {"type": "integer"},
-                        "last": {"type": "boolean"},
-                        "size": {"type": "integer"},
-                        "number": {"type": "integer"},
-                        "sort": {"type": "object"},
-                        "numberOfElements": {"type": "integer"},
-                        "first": {"type": "boolean"},
-                        "empty": {"type": "boolean"}
-                    }
-                }
+        return_schema = self.resolver.resolve_type(java_type)
         
-        # Handle direct entity returns
-        elif return_type in openapi["components"]["schemas"]:
-            return_schema = {"$ref": f"#/components/schemas/{return_type}"}
-        
-        # Handle primitive types
-        elif return_type in ["String", "string"]:
-            return_schema = {"type": "string"}
-        elif return_type in ["Integer", "int", "Long", "long"]:
-            return_schema = {"type": "integer"}
-        elif return_type in ["Double", "double", "Float", "float", "BigDecimal"]:
-            return_schema = {"type": "number"}
-        elif return_type in ["Boolean", "boolean"]:
-            return_schema = {"type": "boolean"}
-        elif return_type in ["void", "Void"]:
+        # Unknown classes without a schema in this contract stay generic objects
+        ref = return_schema.get("$ref", "")
+        if ref and ref.rsplit("/", 1)[-1] not in openapi["components"]["schemas"]:
             return_schema = {"type": "object"}
         
         return return_schema
 
+# Contract writer interface
+class ContractWriter(abc.ABC):
+    extension = ''
+    
+    @abc.abstractmethod
+    def write(self, document: Dict[str, Any], stream: IO[str]) -> None:
+        """Serialize a document straight to an open text stream."""
+        pass
+    
+    def write_file(self, document: Dict[str, Any], output_path: str) -> None:
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as file:
+            self.write(document, file)
+
+# Largest line width both YAML emitters accept; long scalars stay on one line.
+# At PyYAML's default width of 80 the C and Python emitters fold double-quoted
+# scalars at different places. Contracts written with that width are rewritten
+# once, unfolded.
+YAML_LINE_WIDTH = 2**31 - 1
+
+# YAML writer using libyaml's C emitter when it is available
+class YamlContractWriter(ContractWriter):
+    extension = '.yaml'
+    
+    def __init__(self, use_libyaml: Optional[bool] = None):
+        # PyYAML is imported on first use, so JSON output and --help do not need it
+        import yaml
+        if use_libyaml is None:
+            use_libyaml = yaml.__with_libyaml__
+        if use_libyaml and not yaml.__with_libyaml__:
+            raise RuntimeError("PyYAML was built without libyaml")
+        self.dumper = yaml.CSafeDumper if use_libyaml else yaml.SafeDumper
+    
+    def write(self, document: Dict[str, Any], stream: IO[str]) -> None:
+        import yaml
+        # Both emitters fold long lines and print non-ASCII characters differently,
+        # so lines are never folded and non-ASCII characters are always escaped;
+        # the output (and the manifest hashes) then do not depend on libyaml.
+        yaml.dump(document, stream, Dumper=self.dumper, default_flow_style=False,
+                  width=YAML_LINE_WIDTH, allow_unicode=False)
+
+# JSON writer; keys are sorted like the YAML output
+class JsonContractWriter(ContractWriter):
+    extension = '.json'
+    
+    def write(self, document: Dict[str, Any], stream: IO[str]) -> None:
+        json.dump(document, stream, indent=2, sort_keys=True)
+        stream.write("\n")
+
+CONTRACT_WRITERS = {
+    'yaml': YamlContractWriter,
+    'json': JsonContractWriter
+}
+
+def global_response_schema() -> Dict[str, Any]:
+    """Return a fresh GlobalResponseMessage schema with an untyped data property."""
+    return {
+        "type": "object",
+        "properties": {
+            "statusCode": {"type": "integer"},
+            "status": {"type": "string"},
+            "timestamp": {"type": "string", "format": "date-time"},
+            "title": {"type": "string"},
+            "message": {"type": "object"},
+            "description": {"type": "object"},
+            "isError": {"type": "boolean"},
+            "data": {"type": "object"}
+        }
+    }
+
+# Project-wide symbol index used to resolve DTOs wherever they live
+IDENTIFIER_RE = re.compile(r'[A-Za-z_$][\w$]*')
+DTO_SUFFIXES = ('Request', 'Response', 'Dto', 'DTO')
+# Names handled by the type resolver itself, never looked up in the index
+RESOLVER_TYPE_NAMES = (set(JAVA_SCALAR_TYPES) | TypeSchemaResolver.collection_types | TypeSchemaResolver.map_types
+                       | TypeSchemaResolver.wrapper_types | {'Page'})
+
+class JavaSymbol(NamedTuple):
+    """Class recorded in the symbol index."""
+    name: str
+    package: Optional[str]
+    path: str
+    kind: str  # 'controller', 'entity', 'dto', 'enum', 'interface' or 'class'
+    fields: Dict[str, str]  # private, non-static fields and their Java types
+    references: Tuple[str, ...]  # class names used by fields and method signatures
+
+def find_java_files(root_dir: str, walker: Optional[SourceWalker] = None) -> Iterator[str]:
+    return (walker or SourceWalker()).files(root_dir, ('.java',))
+
+def java_type_names(type_text: str) -> Set[str]:
+    """Return the class names a type expression or parameter list may refer to."""
+    return {name for name in IDENTIFIER_RE.findall(type_text) if name[0].isupper() and name not in RESOLVER_TYPE_NAMES}
+
+def symbol_kind(declaration: JavaClass) -> str:
+    annotations = {annotation.name for annotation in declaration.annotations}
+    if annotations & {'RestController', 'Controller'} or declaration.name.endswith('Controller'):
+        return 'controller'
+    if 'Entity' in annotations:
+        return 'entity'
+    if declaration.kind in ('enum', 'interface'):
+        return declaration.kind
+    if declaration.name.endswith(DTO_SUFFIXES):
+        return 'dto'
+    return 'class'
+
+class JavaSymbolIndex:
+    """Every class of a source tree with its package, path, kind and fields.
+    
+    The tree is walked once and each .java file is lexed once, through the
+    shared parse cache when one is given. Lookups by simple name prefer the
+    package of the referencing class. The index can be persisted to JSON;
+    on the next build files whose mtime and size are unchanged are not read
+    again.
+    """
+    FILE_NAME = '.symbols.json'
+    
+    def __init__(self, root_dir: str, parse_cache: Optional[JavaParseCache] = None):
+        self.root_dir = root_dir
+        self.parse_cache = parse_cache or JavaParseCache(None)
+        # path -> (mtime_ns, size, symbols), in walk order
+        self.files: Dict[str, Tuple[int, int, List[JavaSymbol]]] = {}
+        self.by_name: Dict[str, List[JavaSymbol]] = {}
+    
+    @classmethod
+    def build(cls, root_dir: str, cache_path: Optional[str] = None, profiler: Optional[Profiler] = None,
+              parse_cache: Optional[JavaParseCache] = None, java_files: Optional[Iterable[str]] = None,
+              walker: Optional[SourceWalker] = None) -> 'JavaSymbolIndex':
+        """Walk root_dir and index every Java class, reusing cache_path entries if given.
+        
+        java_files replaces the walk with a file list that was already
+        collected, e.g. by the easy_scripts pipeline.
+        """
+        profiler = profiler or Profiler()
+        index = cls(root_dir, parse_cache)
+        cached = index.load(cache_path) if cache_path else {}
+        with profiler.span('walk', path=root_dir):
+            for path in find_java_files(root_dir, walker) if java_files is None else java_files:
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entry = cached.get(path)
+                if entry and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                    index.files[path] = entry
+                else:
+                    index.files[path] = (stat.st_mtime_ns, stat.st_size, index.scan_file(path))
+            index.rebuild_names()
+        if cache_path:
+            index.save(cache_path)
+        return index
+    
+    def scan_file(self, path: str) -> List[JavaSymbol]:
+        """Lex a Java file and return the classes it declares."""
+        try:
+            source = self.parse_cache.parse(path)
+        except OSError:
+            return []
+        
+        fields: Dict[str, Dict[str, str]] = {}
+        references: Dict[str, Set[str]] = {}
+        for field in source.fields:
+            references.setdefault(field.owner, set()).update(java_type_names(field.type))
+            if 'private' in field.modifiers and 'static' not in field.modifiers:
+                fields.setdefault(field.owner, {})[field.name] = field.type
+        for method in source.methods:
+            references.setdefault(method.owner, set()).update(java_type_names(method.return_type), java_type_names(method.parameters))
+        
+        symbols = []
+        for declaration in source.classes:
+            names = references.get(declaration.name, set()) - {declaration.name}
+            symbols.append(JavaSymbol(declaration.name, source.package, path, symbol_kind(declaration),
+                                      fields.get(declaration.name, {}), tuple(sorted(names))))
+        return symbols
+    
+    def rebuild_names(self) -> None:
+        self.by_name = {}
+        for path in sorted(self.files):
+            for symbol in self.files[path][2]:
+                self.by_name.setdefault(symbol.name, []).append(symbol)
+    
+    def update(self, path: str) -> None:
+        """Re-index a single changed, created or deleted file."""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self.files.pop(path, None)
+        else:
+            self.files[path] = (stat.st_mtime_ns, stat.st_size, self.scan_file(path))
+        self.rebuild_names()
+    
+    def symbols_in(self, path: str) -> List[JavaSymbol]:
+        entry = self.files.get(path)
+        return entry[2] if entry else []
+    
+    def lookup(self, name: str, package: Optional[str] = None) -> Optional[JavaSymbol]:
+        """Return the class with this simple name, preferring the given package."""
+        candidates = self.by_name.get(name)
+        if not candidates:
+            return None
+        return next((symbol for symbol in candidates if symbol.package == package), candidates[0])
+    
+    def dependencies(self, names: Iterable[str], package: Optional[str] = None) -> Dict[str, Optional[JavaSymbol]]:
+        """Resolve names and every class they reference, transitively.
+        
+        Names that are not in the index map to None.
+        """
+        resolved: Dict[str, Optional[JavaSymbol]] = {}
+        pending = [(name, package) for name in sorted(names, reverse=True)]
+        while pending:
+            name, package = pending.pop()
+            if name in resolved:
+                continue
+            symbol = resolved[name] = self.lookup(name, package)
+            if symbol:
+                pending.extend((reference, symbol.package) for reference in reversed(symbol.references))
+        return resolved
+    
+    def controller_paths(self) -> List[str]:
+        return [path for path in self.files if path.endswith('Controller.java')]
+    
+    def controller_dependencies(self, controller_path: str) -> Dict[str, Optional[JavaSymbol]]:
+        """Classes a controller's contract can depend on, by name."""
+        symbols = self.symbols_in(controller_path)
+        controller = symbols[0] if symbols else None
+        entity = os.path.basename(controller_path)[:-15]  # Remove 'Controller.java'
+        names = {f"{entity}Request", f"{entity}Response"} | set(controller.references if controller else ())
+        return self.dependencies(names, controller.package if controller else None)
+    
+    def fingerprint(self, controller_path: str) -> str:
+        """Hash of the declarations a controller's contract depends on."""
+        data = [
+            [name, symbol and [symbol.package, symbol.kind, symbol.fields]]
+            for name, symbol in sorted(self.controller_dependencies(controller_path).items())
+        ]
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def dependents(self, names: Set[str]) -> List[str]:
+        """Return the controllers whose contracts depend on any of these class names."""
+        return [path for path in self.controller_paths() if names & self.controller_dependencies(path).keys()]
+    
+    def load(self, cache_path: str) -> Dict[str, Tuple[int, int, List[JavaSymbol]]]:
+        """Read persisted entries; a different root or generator version discards them."""
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+        if data.get('root') != self.root_dir or data.get('generator') != ContractManifest.generator_version():
+            return {}
+        return {
+            path: (mtime, size, [JavaSymbol(name, package, path, kind, fields, tuple(references))
+                                 for name, package, kind, fields, references in symbols])
+            for path, (mtime, size, symbols) in data.get('files', {}).items()
+        }
+    
+    def save(self, cache_path: str) -> None:
+        files = {
+            path: [mtime, size, [[s.name, s.package, s.kind, s.fields, list(s.references)] for s in symbols]]
+            for path, (mtime, size, symbols) in self.files.items()
+        }
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({'generator': ContractManifest.generator_version(), 'root': self.root_dir, 'files': files}, file)
+        os.replace(tmp_path, cache_path)
+
 # OpenAPI generator class
 class OpenAPIGenerator:
     def __init__(self, 
@@ -458,7 +747,11 @@ class OpenAPIGenerator:
                  controller_parser: JavaControllerParser,
                  parameter_parser: ParameterParser,
                  return_type_handler: ReturnTypeHandler,
-                 type_converter: JavaTypeConverter):
+                 type_converter: JavaTypeConverter,
+                 contract_writer: Optional[ContractWriter] = None,
+                 profiler: Optional[Profiler] = None,
+                 symbol_index: Optional[JavaSymbolIndex] = None,
+                 parse_cache: Optional[JavaParseCache] = None):
         self.classifier = classifier
         self.endpoint_detector = endpoint_detector
         self.java_class_parser = java_class_parser
@@ -466,16 +759,53 @@ class OpenAPIGenerator:
         self.parameter_parser = parameter_parser
         self.return_type_handler = return_type_handler
         self.type_converter = type_converter
+        self.contract_writer = contract_writer or YamlContractWriter()
+        self.profiler = profiler or Profiler()
+        self.symbol_index = symbol_index
+        self.parse_cache = parse_cache or JavaParseCache(None)
     
     def generate_openapi_contract(self, controller_path: str, request_path: str, response_path: str, output_path: str) -> None:
         """Generate an OpenAPI contract from Java files."""
-        with open(controller_path, 'r') as file:
-            controller_content = file.read()
+        openapi = self.build_openapi_document(controller_path, request_path, response_path)
+        with self.profiler.span('write', path=output_path):
+            self.contract_writer.write_file(openapi, output_path)
+            self.profiler.count_file_size('bytes_written', output_path)
         
-        class_name, base_path, endpoints = self.controller_parser.parse_controller(controller_content, self.classifier)
-        
-        # Apply endpoint detector to find missing endpoints
-        endpoints = self.endpoint_detector.detect_missing_endpoints(endpoints, class_name.replace('Controller', ''))
+        print(f"OpenAPI contract generated: {output_path}")
+    
+    def read_text(self, path: str) -> str:
+        with self.profiler.span('read', path=path):
+            with open(path, 'r', encoding='utf-8') as file:
+                content = file.read()
+            self.profiler.count_text('bytes_read', content)
+        return content
+    
+    def parse_controller_file(self, path: str) -> Tuple[str, str, List[Dict[str, Any]]]:
+        """Parse a controller, from the parse cache unless the controller parser only handles text."""
+        if parses_sources(self.controller_parser, 'parse_controller'):
+            source = self.parse_cache.parse(path, profiler=self.profiler)
+            with self.profiler.span('parse', path=path):
+                return self.controller_parser.parse_source(source, self.classifier)
+        content = self.read_text(path)
+        with self.profiler.span('parse', path=path):
+            return self.controller_parser.parse_controller(content, self.classifier)
+    
+    def parse_class_file(self, path: str) -> Tuple[str, Dict[str, str]]:
+        """Parse a Request or Response class, from the parse cache unless the class parser only handles text."""
+        if parses_sources(self.java_class_parser, 'parse_file'):
+            source = self.parse_cache.parse(path, profiler=self.profiler)
+            with self.profiler.span('parse', path=path):
+                return self.java_class_parser.parse_source(source)
+        content = self.read_text(path)
+        with self.profiler.span('parse', path=path):
+            return self.java_class_parser.parse_file(content)
+    
+    def build_openapi_document(self, controller_path: str, request_path: str, response_path: str) -> Dict[str, Any]:
+        """Build the OpenAPI document of a single controller without writing it."""
+        class_name, base_path, endpoints = self.parse_controller_file(controller_path)
+        with self.profiler.span('parse', path=controller_path):
+            # Apply endpoint detector to find missing endpoints
+            endpoints = self.endpoint_detector.detect_missing_endpoints(endpoints, class_name.replace('Controller', ''))
         
         # Extract entity name from controller name
         entity_name = class_name.replace('Controller', '')
@@ -490,150 +820,668 @@ class OpenAPIGenerator:
             "paths": {},
             "components": {
                 "schemas": {
-                    "GlobalResponseMessage": {
-                        "type": "object",
-                        "properties": {
-                            "statusCode": {"type": "integer"},
-                            "status": {"type": "string"},
-                            "timestamp": {"type": "string", "format": "date-time"},
-                            "title": {"type": "string"},
-                            "message": {"type": "object"},
-                            "description": {"type": "object"},
-                            "isError": {"type": "boolean"},
-                            "data": {"type": "object"}
-                        }
-                    }
+                    "GlobalResponseMessage": global_response_schema()
                 }
             }
         }
         
-        # Parse Request and Response files if they exist
-        if os.path.exists(request_path):
-            with open(request_path, 'r') as file:
-                request_content = file.read()
-            request_class, request_properties = self.java_class_parser.parse_file(request_content)
-            openapi["components"]["schemas"][request_class] = {
-                "type": "object",
-                "properties": {
-                    prop: self.type_converter.to_openapi_type(type)
-                    for prop, type in request_properties.items()
+        if self.symbol_index is not None:
+            # Request and Response DTOs may live in any package of the tree
+            symbols = self.symbol_index.symbols_in(controller_path)
+            package = symbols[0].package if symbols else None
+            self.add_class_schemas(openapi, [f"{entity_name}Request", f"{entity_name}Response"], package)
+        else:
+            # Parse Request and Response files if they exist
+            if os.path.exists(request_path):
+                request_class, request_properties = self.parse_class_file(request_path)
+                openapi["components"]["schemas"][request_class] = {
+                    "type": "object",
+                    "properties": {
+                        prop: self.type_converter.to_openapi_type(type)
+                        for prop, type in request_properties.items()
+                    }
                 }
-            }
         
-        if os.path.exists(response_path):
-            with open(response_path, 'r') as file:
-                response_content = file.read()
-            response_class, response_properties = self.java_class_parser.parse_file(response_content)
-            openapi["components"]["schemas"][response_class] = {
-                "type": "object",
-                "properties": {
-                    prop: self.type_converter.to_openapi_type(type)
-                    for prop, type in response_properties.items()
+            if os.path.exists(response_path):
+                response_class, response_properties = self.parse_class_file(response_path)
+                openapi["components"]["schemas"][response_class] = {
+                    "type": "object",
+                    "properties": {
+                        prop: self.type_converter.to_openapi_type(type)
+                        for prop, type in response_properties.items()
+                    }
                 }
-            }
         
-        for endpoint in endpoints:
-            full_path = f"{base_path}{endpoint['path']}"
-            if full_path not in openapi["paths"]:
-                openapi["paths"][full_path] = {}
-            
-            # Handle different return types
-            return_schema = self.return_type_handler.handle_return_type(endpoint['return_type'], openapi)
-            
-            openapi["paths"][full_path][endpoint['method']] = {
-                "summary": f"{endpoint['name']}",
-                "responses": {
-                    "200": {
-                        "description": "Successful operation",
-                        "content": {
-                            "application/json": {
-                                "schema": return_schema
+        with self.profiler.span('transform', path=controller_path):
+            for endpoint in endpoints:
+                full_path = f"{base_path}{endpoint['path']}"
+                if full_path not in openapi["paths"]:
+                    openapi["paths"][full_path] = {}
+                
+                # Handle different return types
+                if self.symbol_index is not None:
+                    self.add_class_schemas(openapi, java_type_names(endpoint['return_type']), package)
+                return_schema = self.return_type_handler.handle_return_type(endpoint['return_type'], openapi)
+                
+                openapi["paths"][full_path][endpoint['method']] = {
+                    "summary": f"{endpoint['name']}",
+                    "responses": {
+                        "200": {
+                            "description": "Successful operation",
+                            "content": {
+                                "application/json": {
+                                    "schema": return_schema
+                                }
                             }
                         }
                     }
                 }
-            }
-            
-            if endpoint['parameters']:
-                openapi["paths"][full_path][endpoint['method']]["parameters"] = []
-                for param in endpoint['parameters'].split(','):
-                    param_type, param_name, data_type = self.parameter_parser.parse(param)
-                    if param_type == 'path':
-                        openapi["paths"][full_path][endpoint['method']]["parameters"].append({
-                            "name": param_name,
-                            "in": "path",
-                            "required": True,
-                            "schema": {
-                                "type": data_type
-                            }
-                        })
-                    elif param_type == 'body':
-                        # Use the entity name for the request body reference
-                        openapi["paths"][full_path][endpoint['method']]["requestBody"] = {
-                            "content": {
-                                "application/json": {
-                                    "schema": {
-                                        "$ref": f"#/components/schemas/{entity_name}Request"
+                
+                if endpoint['parameters']:
+                    openapi["paths"][full_path][endpoint['method']]["parameters"] = []
+                    for param in split_parameters(endpoint['parameters']):
+                        param_type, param_name, data_type = self.parameter_parser.parse(param)
+                        if param_type == 'path':
+                            openapi["paths"][full_path][endpoint['method']]["parameters"].append({
+                                "name": param_name,
+                                "in": "path",
+                                "required": True,
+                                "schema": {
+                                    "type": data_type
+                                }
+                            })
+                        elif param_type == 'body':
+                            # Use the entity name for the request body reference
+                            openapi["paths"][full_path][endpoint['method']]["requestBody"] = {
+                                "content": {
+                                    "application/json": {
+                                        "schema": {
+                                            "$ref": f"#/components/schemas/{entity_name}Request"
+                                        }
                                     }
                                 }
                             }
-                        }
-                    elif param_type == 'query':
-                        openapi["paths"][full_path][endpoint['method']]["parameters"].append({
-                            "name": param_name,
-                            "in": "query",
-                            "schema": {
-                                "type": data_type
-                            }
-                        })
+                        elif param_type == 'query':
+                            openapi["paths"][full_path][endpoint['method']]["parameters"].append({
+                                "name": param_name,
+                                "in": "query",
+                                "schema": {
+                                    "type": data_type
+                                }
+                            })
         
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        with open(output_path, "w") as yaml_file:
-            yaml.dump(openapi, yaml_file, default_flow_style=False)
+        return openapi
+    
+    def add_class_schemas(self, openapi: Dict[str, Any], names: Iterable[str], package: Optional[str]) -> None:
+        """Add the schemas of indexed classes and of every class they reference."""
+        schemas = openapi["components"]["schemas"]
+        for name, symbol in self.symbol_index.dependencies(names, package).items():
+            if symbol is not None and name not in schemas:
+                schemas[name] = self.class_schema(symbol)
+    
+    def class_schema(self, symbol: JavaSymbol) -> Dict[str, Any]:
+        if symbol.kind == 'enum':
+            return {"type": "string"}
+        return {
+            "type": "object",
+            "properties": {
+                prop: self.type_converter.to_openapi_type(type)
+                for prop, type in symbol.fields.items()
+            }
+        }
+
+class MergedOpenAPIDocument:
+    """Single OpenAPI document accumulated from per-controller documents.
+    
+    Each controller document is folded in and can be discarded right away,
+    so memory grows with the size of the merged API rather than with the
+    number of controller files. Schemas are interned by name; a path/method
+    pair or schema name defined differently by two controllers is recorded
+    as a collision and the first definition is kept.
+    """
+    def __init__(self, title: str, description: str):
+        self.document = {
+            "openapi": "3.0.0",
+            "info": {
+                "title": title,
+                "version": "1.0.0",
+                "description": description
+            },
+            "paths": {},
+            "components": {
+                "schemas": {
+                    # data varies per endpoint, so the shared schema stays untyped
+                    "GlobalResponseMessage": global_response_schema()
+                }
+            }
+        }
+        self.path_sources: Dict[Tuple[str, str], str] = {}
+        self.schema_sources: Dict[str, str] = {"GlobalResponseMessage": "<shared>"}
+        self.collisions: List[str] = []
+    
+    def add(self, openapi: Dict[str, Any], source: str) -> None:
+        """Fold a controller document into the merged document."""
+        schemas = self.document["components"]["schemas"]
+        for name, schema in openapi["components"]["schemas"].items():
+            if name == "GlobalResponseMessage":
+                continue
+            if name not in schemas:
+                schemas[name] = schema
+                self.schema_sources[name] = source
+            elif schemas[name] != schema:
+                self.collisions.append(f"Schema '{name}' in {source} conflicts with {self.schema_sources[name]}")
         
-        print(f"OpenAPI contract generated: {output_path}")
+        paths = self.document["paths"]
+        for path, operations in openapi["paths"].items():
+            merged_operations = paths.setdefault(path, {})
+            for method, operation in operations.items():
+                if method not in merged_operations:
+                    merged_operations[method] = operation
+                    self.path_sources[(path, method)] = source
+                else:
+                    self.collisions.append(f"{method.upper()} {path} in {source} conflicts with {self.path_sources[(path, method)]}")
+    
+    def write(self, output_path: str, contract_writer: ContractWriter) -> None:
+        contract_writer.write_file(self.document, output_path)
 
-def process_directory(root_dir: str) -> None:
-    """Process a directory and generate OpenAPI contracts for all controllers."""
+def build_generator(output_format: str = 'yaml', profile: bool = False, symbol_index: Optional[JavaSymbolIndex] = None,
+                    parse_cache: Optional[JavaParseCache] = None) -> OpenAPIGenerator:
+    """Create an OpenAPI generator wired with the standard strategies."""
     # Create instances of all required components
     classifier = RegexEndpointClassifier()
     endpoint_detector = StandardRESTEndpointDetector(classifier)
     java_class_parser = StandardJavaClassParser()
     controller_parser = StandardJavaControllerParser()
-    parameter_parser = RegexParameterParser()
-    return_type_handler = StandardReturnTypeHandler()
+    parameter_parser = StandardParameterParser()
     type_converter = StandardJavaTypeConverter()
+    # One resolver cache is shared by fields and return types
+    return_type_handler = StandardReturnTypeHandler(type_converter.resolver)
     
     # Create the OpenAPI generator
-    generator = OpenAPIGenerator(
+    return OpenAPIGenerator(
         classifier=classifier,
         endpoint_detector=endpoint_detector,
         java_class_parser=java_class_parser,
         controller_parser=controller_parser,
         parameter_parser=parameter_parser,
         return_type_handler=return_type_handler,
-        type_converter=type_converter
+        type_converter=type_converter,
+        contract_writer=CONTRACT_WRITERS[output_format](),
+        profiler=Profiler(profile),
+        symbol_index=symbol_index,
+        parse_cache=parse_cache
     )
+
+def controller_task(root_dir: str, dirpath: str, filename: str, output_dir: str = 'api_contracts', extension: str = '.yaml',
+                    symbol_index: Optional[JavaSymbolIndex] = None) -> Tuple[str, str, str, str]:
+    """Return the (controller, request, response, output) paths of a controller file.
+    
+    With a symbol index the DTOs are looked up by name anywhere in the tree;
+    otherwise they are expected next to the controller.
+    """
+    entity = filename[:-15]  # Remove 'Controller.java'
+    controller_path = os.path.join(dirpath, filename)
+    request_path = os.path.join(dirpath, f"{entity}Request.java")
+    response_path = os.path.join(dirpath, f"{entity}Response.java")
+    if symbol_index is not None:
+        dependencies = symbol_index.controller_dependencies(controller_path)
+        request, response = dependencies.get(f"{entity}Request"), dependencies.get(f"{entity}Response")
+        request_path = request.path if request else request_path
+        response_path = response.path if response else response_path
+    
+    relative_path = os.path.relpath(dirpath, root_dir)
+    output_path = os.path.join(output_dir, relative_path, f"{entity}_api{extension}")
     
-    for dirpath, dirnames, filenames in os.walk(root_dir):
+    return controller_path, request_path, response_path, output_path
+
+def find_controllers(root_dir: str, output_dir: str = 'api_contracts', extension: str = '.yaml',
+                     symbol_index: Optional[JavaSymbolIndex] = None, walker: Optional[SourceWalker] = None) -> Iterator[Tuple[str, str, str, str]]:
+    """Yield (controller, request, response, output) paths for every controller under root_dir."""
+    if symbol_index is not None:
+        for controller_path in symbol_index.controller_paths():
+            dirpath, filename = os.path.split(controller_path)
+            yield controller_task(root_dir, dirpath, filename, output_dir, extension, symbol_index)
+        return
+    for dirpath, filenames in (walker or SourceWalker()).walk(root_dir, ('Controller.java',)):
         for filename in filenames:
-            if filename.endswith('Controller.java'):
-                entity = filename[:-15]  # Remove 'Controller.java'
-                controller_path = os.path.join(dirpath, filename)
-                request_path = os.path.join(dirpath, f"{entity}Request.java")
-                response_path = os.path.join(dirpath, f"{entity}Response.java")
-                
-                relative_path = os.path.relpath(dirpath, root_dir)
-                output_path = os.path.join('api_contracts', relative_path, f"{entity}_api.yaml")
-                
-                generator.generate_openapi_contract(controller_path, request_path, response_path, output_path)
+            yield controller_task(root_dir, dirpath, filename, output_dir, extension)
 
-if __name__ == "__main__":
-    # Default to src/main/java if no input is provided
-    root_dir = "src/main/java"
+# Generator owned by each worker process, built once by _init_worker
+_worker_generator: Optional[OpenAPIGenerator] = None
+
+def _init_worker(output_format: str = 'yaml', profile: bool = False, symbol_index: Optional[JavaSymbolIndex] = None,
+                 parse_cache: Optional[JavaParseCache] = None) -> None:
+    """Build the strategy objects once per worker process."""
+    global _worker_generator
+    _worker_generator = build_generator(output_format, profile, symbol_index, parse_cache)
+
+def _profile_data(generator: OpenAPIGenerator) -> Optional[Tuple[List[Dict[str, Any]], Dict[str, int], int]]:
+    return generator.profiler.collect() if generator.profiler.enabled else None
+
+def _generate_task(task: Tuple[str, str, str, str]) -> Tuple[str, Optional[str], Any]:
+    """Generate a single contract and return (controller_path, error message or None, profile data)."""
+    generator = _worker_generator or build_generator()
+    generator.profiler.count('files')
+    try:
+        with generator.profiler.span('controller', 'file', path=task[0]):
+            generator.generate_openapi_contract(*task)
+    except Exception as e:
+        return task[0], f"{type(e).__name__}: {e}", _profile_data(generator)
+    return task[0], None, _profile_data(generator)
+
+def _build_task(task: Tuple[str, str, str, str]) -> Tuple[str, Optional[Dict[str, Any]], Optional[str], Any]:
+    """Build a single controller document and return (controller_path, document, error message, profile data)."""
+    generator = _worker_generator or build_generator()
+    generator.profiler.count('files')
+    try:
+        with generator.profiler.span('controller', 'file', path=task[0]):
+            openapi = generator.build_openapi_document(*task[:3])
+    except Exception as e:
+        return task[0], None, f"{type(e).__name__}: {e}", _profile_data(generator)
+    return task[0], openapi, None, _profile_data(generator)
+
+def process_directory_merged(root_dir: str, output_path: str, jobs: int = 1, output_format: str = 'yaml',
+                             profiler: Optional[Profiler] = None, parse_cache: Optional[JavaParseCache] = None,
+                             java_files: Optional[Iterable[str]] = None, walker: Optional[SourceWalker] = None) -> List[Tuple[str, str]]:
+    """Generate one OpenAPI document for every controller under root_dir.
+    
+    Controller documents are merged in walk order as they arrive, so the
+    result is the same for any number of jobs. Failing controllers and
+    path/schema collisions are returned as (source, message) pairs.
+    """
+    profiler = profiler or Profiler()
+    symbol_index = JavaSymbolIndex.build(root_dir, profiler=profiler, parse_cache=parse_cache, java_files=java_files, walker=walker)
+    tasks = list(find_controllers(root_dir, symbol_index=symbol_index))
+    merged = MergedOpenAPIDocument("API", f"API for all controllers under {root_dir}")
+    failures = []
+    
+    if jobs > 1 and len(tasks) > 1:
+        pool = multiprocessing.Pool(min(jobs, len(tasks)), initializer=_init_worker,
+                                    initargs=(output_format, profiler.enabled, symbol_index, parse_cache))
+        results = pool.imap(_build_task, tasks, chunksize=max(1, len(tasks) // (jobs * 4)))
+    else:
+        pool = None
+        _init_worker(output_format, profiler.enabled, symbol_index, parse_cache)
+        results = (_build_task(task) for task in tasks)
+    
+    try:
+        for controller_path, openapi, error, profile_data in results:
+            if profile_data:
+                profiler.merge(profile_data)
+            if error:
+                print(f"Error processing {controller_path}: {error}")
+                failures.append((controller_path, error))
+            else:
+                merged.add(openapi, controller_path)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    
+    for collision in merged.collisions:
+        print(f"Collision: {collision}")
+        failures.append((output_path, collision))
+    
+    with profiler.span('write', path=output_path):
+        merged.write(output_path, CONTRACT_WRITERS[output_format]())
+        profiler.count_file_size('bytes_written', output_path)
+    print(f"Merged OpenAPI contract generated: {output_path}")
+    return failures
+
+class ContractManifest:
+    """Content-hash manifest stored next to the generated contracts.
+    
+    For every contract it records the output format and the hashes of the
+    controller, request and response sources and of the written file, so
+    unchanged controllers can be skipped and contracts of deleted controllers
+    can be removed. With a symbol index it also records a fingerprint of
+    every class the contract depends on. Entries outlive a change of the
+    generator or of the output format, so the contracts they point to are
+    still cleaned up.
+    """
+    FILE_NAME = '.manifest.json'
+    
+    def __init__(self, output_dir: str, output_format: str = 'yaml', symbol_index: Optional[JavaSymbolIndex] = None):
+        self.output_dir = output_dir
+        self.output_format = output_format
+        self.symbol_index = symbol_index
+        self.path = os.path.join(output_dir, self.FILE_NAME)
+        self.generator_hash = self.generator_version()
+        self.entries: Dict[str, Dict[str, Optional[str]]] = {}
+        # Set when the manifest was written by another generator version: no entry is up to date
+        self.outdated = False
+        self.load()
+    
+    @classmethod
+    def generator_version(cls) -> str:
+        """Hash of this generator and of the shared Java parser it uses."""
+        return hashlib.sha256(f"{cls.hash_file(os.path.abspath(__file__))}:{PARSER_VERSION}".encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def hash_file(path: str) -> Optional[str]:
+        """Return the SHA-256 of a file, or None if it does not exist."""
+        try:
+            with open(path, 'rb') as file:
+                return hashlib.sha256(file.read()).hexdigest()
+        except FileNotFoundError:
+            return None
+    
+    def load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return
+        # A different generator version invalidates every entry, but the entries are
+        # kept so that the contracts of controllers deleted meanwhile are still removed
+        self.outdated = data.get('generator') != self.generator_hash
+        # Manifests without a format per entry recorded it once for all of them
+        default_format = data.get('format', 'yaml')
+        self.entries = {key: {'format': default_format, **entry} for key, entry in data.get('contracts', {}).items()}
+    
+    def save(self) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({'generator': self.generator_hash, 'contracts': self.entries}, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+    
+    def _key(self, output_path: str) -> str:
+        return os.path.relpath(output_path, self.output_dir).replace(os.sep, '/')
+    
+    def input_hashes(self, task: Tuple[str, str, str, str]) -> Dict[str, Optional[str]]:
+        controller_path, request_path, response_path, _ = task
+        hashes = {
+            'controller': self.hash_file(controller_path),
+            'request': self.hash_file(request_path),
+            'response': self.hash_file(response_path)
+        }
+        if self.symbol_index is not None:
+            hashes['dependencies'] = self.symbol_index.fingerprint(controller_path)
+        return hashes
+    
+    def is_up_to_date(self, task: Tuple[str, str, str, str], hashes: Dict[str, Optional[str]]) -> bool:
+        """Return True if the task's inputs and its written output are unchanged."""
+        entry = self.entries.get(self._key(task[3]))
+        if self.outdated or not entry or entry.get('format') != self.output_format:
+            return False
+        if any(entry.get(name) != value for name, value in hashes.items()):
+            return False
+        return entry.get('output') == self.hash_file(task[3])
+    
+    def record(self, task: Tuple[str, str, str, str], hashes: Dict[str, Optional[str]]) -> None:
+        self.entries[self._key(task[3])] = {**hashes, 'format': self.output_format, 'output': self.hash_file(task[3])}
+    
+    def record_failure(self, task: Tuple[str, str, str, str]) -> None:
+        """Keep the entry of a failing controller without input hashes: it is retried next time, and its contract is removed once the controller is deleted."""
+        self.entries[self._key(task[3])] = {'format': self.output_format, 'output': self.hash_file(task[3])}
+    
+    def remove(self, output_path: str) -> bool:
+        """Delete a contract, the package directories it leaves empty and its entry; return whether the file existed."""
+        self.entries.pop(self._key(output_path), None)
+        try:
+            os.remove(output_path)
+        except FileNotFoundError:
+            return False
+        output_dir = os.path.abspath(self.output_dir)
+        directory = os.path.dirname(os.path.abspath(output_path))
+        while directory != output_dir and os.path.commonpath([output_dir, directory]) == output_dir:
+            try:
+                os.rmdir(directory)
+            except OSError:
+                # Not empty: another contract or a file of the user is still in there
+                break
+            directory = os.path.dirname(directory)
+        return True
+    
+    def remove_stale(self, tasks: List[Tuple[str, str, str, str]]) -> List[str]:
+        """Delete contracts whose controller no longer exists, or written in another format, and return their paths."""
+        live = {self._key(task[3]) for task in tasks}
+        removed = []
+        for key in sorted(set(self.entries) - live):
+            output_path = os.path.join(self.output_dir, *key.split('/'))
+            self.remove(output_path)
+            removed.append(output_path)
+        return removed
+
+def process_directory(root_dir: str, jobs: int = 1, output_dir: str = 'api_contracts', incremental: bool = True, output_format: str = 'yaml',
+                      profiler: Optional[Profiler] = None, parse_cache: Optional[JavaParseCache] = None,
+                      java_files: Optional[Iterable[str]] = None, walker: Optional[SourceWalker] = None) -> List[Tuple[str, str]]:
+    """Process a directory and generate OpenAPI contracts for all controllers.
+    
+    With jobs > 1 controllers are fanned out to a process pool. A failing
+    controller is reported and skipped; the (controller_path, error) pairs
+    are returned to the caller. When incremental is set, controllers whose
+    inputs are unchanged according to the manifest are skipped.
+    """
+    profiler = profiler or Profiler()
+    index_path = os.path.join(output_dir, JavaSymbolIndex.FILE_NAME)
+    symbol_index = JavaSymbolIndex.build(root_dir, index_path if incremental else None, profiler, parse_cache, java_files, walker)
+    tasks = list(find_controllers(root_dir, output_dir, CONTRACT_WRITERS[output_format].extension, symbol_index))
+    failures = []
+    
+    manifest = ContractManifest(output_dir, output_format, symbol_index) if incremental else None
+    hashes = {}
+    pending = tasks
+    if manifest:
+        for output_path in manifest.remove_stale(tasks):
+            print(f"Stale contract removed: {output_path}")
+        hashes = {task: manifest.input_hashes(task) for task in tasks}
+        pending = [task for task in tasks if not manifest.is_up_to_date(task, hashes[task])]
+        if len(pending) < len(tasks):
+            print(f"{len(tasks) - len(pending)} contract(s) up to date, skipped.")
+    
+    if jobs > 1 and len(pending) > 1:
+        with multiprocessing.Pool(min(jobs, len(pending)), initializer=_init_worker,
+                                  initargs=(output_format, profiler.enabled, symbol_index, parse_cache)) as pool:
+            results = list(pool.imap(_generate_task, pending, chunksize=max(1, len(pending) // (jobs * 4))))
+    else:
+        _init_worker(output_format, profiler.enabled, symbol_index, parse_cache)
+        results = [_generate_task(task) for task in pending]
+    
+    for task, (controller_path, error, profile_data) in zip(pending, results):
+        if profile_data:
+            profiler.merge(profile_data)
+        if error:
+            print(f"Error processing {controller_path}: {error}")
+            failures.append((controller_path, error))
+            if manifest:
+                manifest.record_failure(task)
+        elif manifest:
+            manifest.record(task, hashes[task])
+    
+    if manifest:
+        manifest.save()
+    
+    return failures
+
+# Any class can be a DTO referenced by some controller
+WATCHED_SUFFIXES = ('.java',)
+
+class ContractWatcher:
+    """Regenerates the contracts affected by changes under a source tree.
+    
+    Changes come from watchdog (inotify and friends) when it is installed
+    and from polling file stats otherwise. Bursts of saves are debounced,
+    and the generator and symbol index stay in memory between events; a
+    changed class regenerates every controller that depends on it.
+    """
+    def __init__(self, root_dir: str, output_dir: str = 'api_contracts', output_format: str = 'yaml',
+                 poll_interval: float = 0.25, debounce: float = 0.05, parse_cache: Optional[JavaParseCache] = None,
+                 walker: Optional[SourceWalker] = None):
+        self.root_dir = root_dir
+        self.walker = walker or SourceWalker()
+        self.output_dir = output_dir
+        self.extension = CONTRACT_WRITERS[output_format].extension
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.index_path = os.path.join(output_dir, JavaSymbolIndex.FILE_NAME)
+        self.symbol_index = JavaSymbolIndex.build(root_dir, self.index_path, parse_cache=parse_cache, walker=self.walker)
+        self.generator = build_generator(output_format, symbol_index=self.symbol_index, parse_cache=parse_cache)
+        self.manifest = ContractManifest(output_dir, output_format, self.symbol_index)
+        self.snapshot = self.take_snapshot()
+        self.events: Set[str] = set()
+        self.events_lock = threading.Lock()
+        self.observer = None
+    
+    def take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Return (mtime, size) of every watched file."""
+        snapshot = {}
+        for path in self.walker.files(self.root_dir, WATCHED_SUFFIXES):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+    
+    def start_observer(self) -> bool:
+        """Start a watchdog observer if the package is installed."""
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            return False
+        
+        watcher = self
+        
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                paths = [os.fsdecode(path) for path in (event.src_path, getattr(event, 'dest_path', '')) if path]
+                paths = [path for path in paths if path.endswith(WATCHED_SUFFIXES) and not watcher.walker.ignores(watcher.root_dir, path)]
+                with watcher.events_lock:
+                    watcher.events.update(paths)
+        
+        self.observer = Observer()
+        self.observer.schedule(Handler(), self.root_dir, recursive=True)
+        self.observer.start()
+        return True
+    
+    def collect_changes(self) -> Set[str]:
+        """Return the watched paths changed since the last call."""
+        if self.observer:
+            with self.events_lock:
+                changed, self.events = self.events, set()
+            return changed
+        current = self.take_snapshot()
+        changed = {path for path in current.keys() | self.snapshot.keys() if current.get(path) != self.snapshot.get(path)}
+        self.snapshot = current
+        return changed
+    
+    def affected_tasks(self, changed: Set[str]) -> List[Tuple[str, str, str, str]]:
+        """Re-index changed files and return the tasks of the controllers depending on them."""
+        names = set()
+        controllers = set()
+        for path in changed:
+            # Classes removed from or added to the file both count as changed
+            names.update(symbol.name for symbol in self.symbol_index.symbols_in(path))
+            self.symbol_index.update(path)
+            names.update(symbol.name for symbol in self.symbol_index.symbols_in(path))
+            if path.endswith('Controller.java'):
+                controllers.add(path)
+        controllers.update(self.symbol_index.dependents(names))
+        tasks = []
+        for controller_path in sorted(controllers):
+            dirpath, filename = os.path.split(controller_path)
+            tasks.append(controller_task(self.root_dir, dirpath, filename, self.output_dir, self.extension, self.symbol_index))
+        return tasks
+    
+    def regenerate(self, tasks: List[Tuple[str, str, str, str]]) -> None:
+        for task in tasks:
+            controller_path, _, _, output_path = task
+            if not os.path.exists(controller_path):
+                if self.manifest.remove(output_path):
+                    print(f"Stale contract removed: {output_path}")
+                continue
+            try:
+                self.generator.generate_openapi_contract(*task)
+            except Exception as e:
+                print(f"Error processing {controller_path}: {type(e).__name__}: {e}")
+                self.manifest.record_failure(task)
+                continue
+            self.manifest.record(task, self.manifest.input_hashes(task))
+        self.manifest.save()
+        self.symbol_index.save(self.index_path)
+    
+    def run(self) -> None:
+        mode = "events" if self.start_observer() else f"polling every {self.poll_interval:g}s"
+        tick = 0.01 if self.observer else self.poll_interval
+        print(f"Watching {self.root_dir} ({mode}), press Ctrl+C to stop...")
+        pending: Set[str] = set()
+        last_change = 0.0
+        try:
+            while True:
+                time.sleep(tick)
+                changed = self.collect_changes()
+                if changed:
+                    pending |= changed
+                    last_change = time.monotonic()
+                    continue
+                # Wait for a burst of saves to settle before regenerating
+                if pending and time.monotonic() - last_change >= self.debounce:
+                    start = time.perf_counter()
+                    self.regenerate(self.affected_tasks(pending))
+                    print(f"Updated in {(time.perf_counter() - start) * 1000:.0f} ms")
+                    pending = set()
+        except KeyboardInterrupt:
+            print("Watch stopped.")
+        finally:
+            if self.observer:
+                self.observer.stop()
+                self.observer.join()
+
+def cli(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog=prog, description="Generate OpenAPI contracts for Spring Boot controllers.")
+    parser.add_argument("root_dir", nargs="?", default="src/main/java",
+                        help="Root directory of the Java sources (default: src/main/java)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Number of worker processes (0 = CPU count, default: 1)")
+    parser.add_argument("-f", "--force", action="store_true",
+                        help="Regenerate every contract, ignoring the manifest")
+    parser.add_argument("--format", choices=sorted(CONTRACT_WRITERS), default="yaml",
+                        help="Output format of the contracts (default: yaml)")
+    parser.add_argument("-w", "--watch", action="store_true",
+                        help="Keep running and regenerate contracts affected by source changes")
+    parser.add_argument("--poll-interval", type=float, default=0.25,
+                        help="Polling interval in seconds when watchdog is not installed (default: 0.25)")
+    parser.add_argument("--profile", nargs="?", const="openApiGenerator_profile.json", metavar="PATH",
+                        help="Write a Chrome trace of the run with per-file and per-stage spans (default: openApiGenerator_profile.json)")
+    parser.add_argument("-m", "--merged", nargs="?", const="", metavar="PATH",
+                        help="Write a single merged document instead of one file per controller (default: api_contracts/openapi.<format>)")
+    add_cache_arguments(parser)
+    add_walk_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.watch and args.merged is not None:
+        parser.error("--watch cannot be combined with --merged")
+    
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    root_dir = args.root_dir
     print(f"API contract dosyaları oluşturuluyor... Kök dizin: {root_dir}")
     if os.path.exists(root_dir):
-        process_directory(root_dir)
-        print("API contract dosyaları başarıyla oluşturuldu.")
+        profiler = Profiler(args.profile is not None)
+        parse_cache = cache_from_arguments(args)
+        walker = walker_from_arguments(args)
+        if args.merged is not None:
+            merged_path = args.merged or os.path.join("api_contracts", f"openapi{CONTRACT_WRITERS[args.format].extension}")
+            failures = process_directory_merged(root_dir, merged_path, jobs=jobs, output_format=args.format, profiler=profiler,
+                                                parse_cache=parse_cache, walker=walker)
+        else:
+            failures = process_directory(root_dir, jobs=jobs, incremental=not args.force, output_format=args.format, profiler=profiler,
+                                         parse_cache=parse_cache, walker=walker)
+        if profiler.enabled:
+            profiler.write(args.profile)
+        if failures:
+            print(f"{len(failures)} hata oluştu.")
+        else:
+            print("API contract dosyaları başarıyla oluşturuldu.")
+        if args.watch:
+            ContractWatcher(root_dir, output_format=args.format, poll_interval=args.poll_interval, parse_cache=parse_cache,
+                            walker=walker).run()
+        elif failures:
+            return 1
     else:
         print("Belirtilen dizin bulunamadı.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(cli())
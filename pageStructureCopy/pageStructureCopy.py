@@ -1,8 +1,13 @@
 import os
+import sys
+
+# .gitignore'u dikkate alan, tüm scriptlerin ortak dizin dolaşıcısı
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'sourceWalker'))
+from sourceWalker import SourceWalker
 
 def kopyala_dizin_yapisi(kaynak_dizin, hedef_dizin):
-    # Tüm alt dizin ve dosyaları tarar
-    for root, dirs, files in os.walk(kaynak_dizin):
+    # Tüm alt dizinleri tarar; node_modules, dist, .git, target, build ve .gitignore'daki dizinler atlanır
+    for root, files in SourceWalker().walk(kaynak_dizin, extensions=()):
         # Şu anki dizinin kaynak diziye göre göreceli yolunu hesapla
         relative_path = os.path.relpath(root, kaynak_dizin)
         # Hedefteki tam dizin yolu
@@ -3,75 +3,399 @@
 import os
 import re
 import sys
+import mmap
+import argparse
+import functools
+import multiprocessing
 
-def remove_console_logs(file_path):
+# Directory walker honoring .gitignore, shared by every script
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'sourceWalker'))
+from sourceWalker import SourceWalker, add_walk_arguments, walker_from_arguments
+
+# Stage profiler behind --profile, shared with the other tools
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'stageProfiler'))
+from stageProfiler import Profiler
+
+# Staged/changed file selection for hooks and CI, shared by the cleanup scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'gitChangedFiles'))
+from gitChangedFiles import (ChangedFilesError, add_changed_files_arguments, add_hook_arguments,
+                             check_changed_files_arguments, changed_files_from_arguments, restage,
+                             split_unstaged)
+
+# Atomic in-place rewrite through a uniquely named temporary file
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'atomicWrite'))
+from atomicWrite import write_atomic
+
+profiler = Profiler()
+
+CONSOLE_METHODS = ('log', 'error', 'warn', 'info', 'debug', 'trace', 'table')
+
+# console.log(, console?.log( and console.log?.( with any whitespace in between
+CONSOLE_CALL_RE = re.compile(r'console\s*\??\.\s*(?:%s)\s*(?:\?\.\s*)?\(' % '|'.join(CONSOLE_METHODS))
+
+# One token of JavaScript/TypeScript code. Template and regex literals depend on
+# the context and are scanned by TEMPLATE_RE and REGEX_LITERAL_RE instead; strings
+# and regex literals never span lines, so a stray quote in JSX text only affects
+# the rest of its line.
+JS_TOKEN_RE = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<string>"(?:[^"\\\n]|\\.)*"?|'(?:[^'\\\n]|\\.)*'?)
+  | (?P<ident>[A-Za-z_$][\w$]*)
+  | (?P<number>\d[\w.]*)
+  | (?P<symbol>=>|\?\.|\+\+|--|\S)
+''', re.VERBOSE | re.DOTALL)
+
+# The rest of a template literal chunk, up to its closing backtick or the next ${
+TEMPLATE_RE = re.compile(r'(?:[^`\\$]|\\.|\$(?!\{))*(`|\$\{)?', re.DOTALL)
+
+REGEX_LITERAL_RE = re.compile(r'/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\]?)+/[A-Za-z]*')
+
+# Keywords after which an expression starts: a / is a regex literal and a new line does not end the statement
+EXPRESSION_KEYWORDS = frozenset(('return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+                                 'throw', 'case', 'yield', 'await', 'extends'))
+CONTROL_KEYWORDS = frozenset(('if', 'for', 'while', 'with'))
+
+STATEMENT_END_RE = re.compile(r'[ \t]*;?')
+SPACES_RE = re.compile(r'[ \t]*')
+LINE_END_RE = re.compile(r'[ \t]*(?:\r?\n|\Z)')
+
+# A Vue single-file component starts with one of its top-level blocks
+VUE_SFC_RE = re.compile(r'(?:\s|<!--.*?-->)*<(?:template|script|style)\b', re.DOTALL)
+SCRIPT_BLOCK_RE = re.compile(r'(<script\b[^>]*>)(.*?)(</script\s*>)', re.DOTALL | re.IGNORECASE)
+
+DEFAULT_SRC_DIR = 'ogyp-frontend/src'
+
+def statement_position(prev, newline, control):
     """
-    Remove console.log, console.error, console.warn, and console.info statements from a file
-    using parenthesis counting to handle multi-line statements.
+    Classify where a console call starts from the previous significant token:
+    'statement' for a statement of its own, 'block' for the body of an
+    if/for/while/else/do, 'arrow' for the body of an arrow function, and None
+    for an expression whose value is used, e.g. a && console.log(x).
     """
-    with open(file_path, 'r', encoding='utf-8') as file:
-        content = file.read()
+    if prev is None:
+        return 'statement'
+    kind, value = prev
+    if kind == 'symbol':
+        if value in (';', '{', '}'):
+            return 'statement'
+        if value == ')' and control:
+            return 'block'
+        if value == '=>':
+            return 'arrow'
+    elif kind == 'ident' and value in ('else', 'do'):
+        return 'block'
+    # Automatic semicolon insertion: a new line after a complete expression starts a statement
+    if newline and (kind in ('string', 'number', 'regex')
+                    or kind == 'ident' and value not in EXPRESSION_KEYWORDS
+                    or kind == 'symbol' and value in (')', ']', '++', '--')):
+        return 'statement'
+    return None
 
-    # Pattern to match console.log, console.error, console.warn, and console.info statements
-    pattern = r'console\.(log|error|warn|info)\s*\('
-    
-    # Find all matches
-    matches = list(re.finditer(pattern, content))
-    
-    if not matches:
-        return False  # No console statements found
-    
-    # Process the file content from end to beginning to avoid index issues
-    new_content = content
-    modified = False
-    
-    for match in reversed(matches):
-        start_pos = match.start()
-        
-        # Find the end of the statement by counting parentheses
+def find_console_calls(code):
+    """
+    Yield (start, end, position) for each console call of JavaScript/TypeScript
+    code in a single pass. Strings, template literals, comments and regex
+    literals are skipped, so their parentheses never end a call.
+    """
+    pos = 0
+    length = len(code)
+    prev = None        # (kind, value) of the previous significant token
+    newline = False    # a line break since prev
+    control = False    # prev is the ')' of an if/for/while/with
+    case_label = False # inside 'case ...:' or 'default:'
+    parens = []        # per open '(': 'control', 'console' or None
+    braces = []        # per open '{': whether it opened a template substitution
+    call = None        # (start, position) of the console call being scanned
+
+    while pos < length:
+        match = JS_TOKEN_RE.match(code, pos)
+        kind = match.lastgroup
+        value = match.group()
         pos = match.end()
-        paren_count = 1  # We start with one open parenthesis
-        
-        while pos < len(content) and paren_count > 0:
-            if content[pos] == '(':
-                paren_count += 1
-            elif content[pos] == ')':
-                paren_count -= 1
-            pos += 1
-        
-        # If we found the closing parenthesis, check for semicolon
-        if paren_count == 0 and pos < len(content) and content[pos] == ';':
-            pos += 1
-        
-        # Remove the console statement
-        new_content = new_content[:start_pos] + new_content[pos:]
-        modified = True
+        if kind == 'space' or kind == 'comment':
+            if '\n' in value:
+                newline = True
+            continue
+
+        is_control = False
+        if kind == 'ident':
+            if value == 'console' and call is None and not (prev and prev[1] in ('.', '?.')):
+                console = CONSOLE_CALL_RE.match(code, match.start())
+                if console:
+                    call = (match.start(), statement_position(prev, newline, control))
+                    parens.append('console')
+                    pos = console.end()
+                    value, kind = '(', 'symbol'
+            elif value in ('case', 'default'):
+                case_label = True
+        elif kind == 'symbol':
+            if value == '`' or value == '}' and braces and braces[-1]:
+                if value == '}':
+                    braces.pop()
+                template = TEMPLATE_RE.match(code, pos)
+                pos = template.end()
+                if template.group(1) == '${':
+                    braces.append(True)
+                    value = '${'
+                else:
+                    kind = 'string'
+            elif value == '/' and (prev is None or prev[0] == 'symbol' and prev[1] not in (')', ']', '++', '--')
+                                   or prev[0] == 'ident' and prev[1] in EXPRESSION_KEYWORDS):
+                regex = REGEX_LITERAL_RE.match(code, match.start())
+                if regex:
+                    pos = regex.end()
+                    kind = 'regex'
+            elif value == '(':
+                parens.append('control' if prev and prev[0] == 'ident' and prev[1] in CONTROL_KEYWORDS else None)
+            elif value == ')':
+                opened = parens.pop() if parens else None
+                is_control = opened == 'control'
+                if opened == 'console':
+                    yield call[0], pos, call[1]
+                    call = None
+            elif value == '{':
+                braces.append(False)
+            elif value == '}':
+                if braces:
+                    braces.pop()
+                case_label = False
+            elif value == ';':
+                case_label = False
+            elif value == ':' and case_label:
+                # The statements of a switch case follow its label
+                value = ';'
+                case_label = False
+        prev = (kind, value)
+        newline = False
+        control = is_control
+
+def strip_script(code):
+    """Return JavaScript/TypeScript code without its console statements; the output is joined once."""
+    pieces = []
+    last = 0
+    at_blank = True      # the output line so far is whitespace only
+    prev_blank = True    # the output line before it is blank
+
+    def keep(text):
+        nonlocal at_blank, prev_blank
+        if not text:
+            return
+        i = text.rfind('\n')
+        if i < 0:
+            at_blank = at_blank and not text.strip(' \t')
+        else:
+            j = text.rfind('\n', 0, i)
+            if j < 0:
+                prev_blank = at_blank and not text[:i].strip(' \t\r')
+            else:
+                prev_blank = not text[j + 1:i].strip(' \t\r')
+            at_blank = not text[i + 1:].strip(' \t')
+        pieces.append(text)
+
+    for start, end, position in find_console_calls(code):
+        if position is None:
+            continue
+        if position == 'arrow':
+            # () => console.log(x) becomes () => {}; the semicolon may end an enclosing statement
+            keep(code[last:start])
+            pieces.append('{}')
+            at_blank = False
+            last = end
+            continue
+        end = STATEMENT_END_RE.match(code, end).end()
+        if position == 'block':
+            # if (x) console.log(x); else ... becomes if (x) {} else ...
+            keep(code[last:start])
+            pieces.append('{}')
+            at_blank = False
+            last = end
+            continue
+
+        segment = code[last:start]
+        line_end = LINE_END_RE.match(code, end)
+        keep(segment)
+        if at_blank and line_end:
+            # The statement was alone on its line: drop the whole line, and one of
+            # the blank lines around it if it was surrounded by them
+            if pieces and segment:
+                pieces[-1] = pieces[-1].rstrip(' \t')
+            end = line_end.end()
+            if prev_blank:
+                following = LINE_END_RE.match(code, end)
+                if following and following.end() > end:
+                    end = following.end()
+        else:
+            if line_end and segment:
+                # Nothing follows on its line: drop the spaces before it too
+                pieces[-1] = pieces[-1].rstrip(' \t')
+            end = SPACES_RE.match(code, end).end()
+        last = end
+
+    if last == 0:
+        return code
+    keep(code[last:])
+    return ''.join(pieces)
+
+def strip_console_statements(content):
+    """
+    Return content without its console.log, error, warn, info, debug, trace and
+    table statements, including the optional chaining forms. The content is
+    scanned once, so the runtime is linear in its size; in a Vue single-file
+    component only the <script> blocks are changed.
+    """
+    if 'console' not in content:
+        return content
+    if VUE_SFC_RE.match(content):
+        return SCRIPT_BLOCK_RE.sub(lambda block: block.group(1) + strip_script(block.group(2)) + block.group(3), content)
+    return strip_script(content)
+
+def contains_console(file_path):
+    """Return whether a file contains b'console', searching its bytes without decoding them."""
+    with open(file_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return data.find(b'console') >= 0
+
+SOURCE_EXTENSIONS = ('.ts', '.tsx', '.vue')
+
+def remove_console_logs(file_path, write=True):
+    """
+    Remove the console statements of a file; returns True if the file was modified,
+    or with write unset, if it would be.
+    """
+    with profiler.span('read', path=file_path):
+        # Line endings are kept as they are; the file is written back without translation
+        with open(file_path, 'r', encoding='utf-8', newline='') as file:
+            content = file.read()
+        profiler.count_text('bytes_read', content)
+
+    with profiler.span('transform', path=file_path):
+        new_content = strip_console_statements(content)
     
-    if modified:
-        with open(file_path, 'w', encoding='utf-8') as file:
-            file.write(new_content)
+    if new_content != content:
+        if not write:
+            return True
+        with profiler.span('write', path=file_path):
+            write_atomic(file_path, new_content)
+            profiler.count_text('bytes_written', new_content)
         return True
     
     return False
 
-def main():
-    # Find all .ts, .tsx, and .vue files in the ogyp-frontend/src directory
-    src_dir = 'ogyp-frontend/src'
-    modified_count = 0
+def init_worker(profile):
+    global profiler
+    profiler = Profiler(profile)
+
+def clean_file(file_path, write=True):
+    """Return (file_path, modified, error, profile data) for a file; runs in the worker processes."""
+    modified, error = False, None
+    try:
+        with profiler.span('file', 'file', path=file_path):
+            modified = remove_console_logs(file_path, write)
+    except Exception as e:
+        error = e
+    return file_path, modified, error, profiler.collect() if profiler.enabled else None
+
+def find_source_files(src_dir, walker=None):
+    return (walker or SourceWalker()).files(src_dir, SOURCE_EXTENSIONS)
+
+def main(src_dir=DEFAULT_SRC_DIR, profile_path=None, file_paths=None, walker=None, jobs=1, check=False):
+    """
+    Clean the files under src_dir, or only file_paths when given; with check, the
+    files are only reported. Returns the modified (or to be modified) files and the errors.
+    """
+    global profiler
+    profiler = Profiler(profile_path is not None)
+
+    # Find all .ts, .tsx, and .vue files in src_dir, unless a caller already collected them
+    results = {'modified': [], 'errors': []}
     
-    for root, _, files in os.walk(src_dir):
-        for file in files:
-            if file.endswith(('.ts', '.tsx', '.vue')):
-                file_path = os.path.join(root, file)
-                
-                try:
-                    if remove_console_logs(file_path):
-                        print(f"Modified: {file_path}")
-                        modified_count += 1
-                except Exception as e:
-                    print(f"Error processing {file_path}: {e}")
+    with profiler.span('walk', path=src_dir):
+        file_paths = list(find_source_files(src_dir, walker) if file_paths is None else file_paths)
+    profiler.count('files', len(file_paths))
+
+    # Most files never mention console: only those that do are decoded and scanned
+    matches = []
+    with profiler.span('prefilter', path=src_dir):
+        for file_path in file_paths:
+            try:
+                if contains_console(file_path):
+                    matches.append(file_path)
+            except OSError as e:
+                print(f"Error processing {file_path}: {e}")
+                results['errors'].append(file_path)
     
-    print(f"Completed! Modified {modified_count} files.")
+    clean = functools.partial(clean_file, write=not check)
+    if jobs > 1 and len(matches) > 1:
+        pool = multiprocessing.Pool(min(jobs, len(matches)), initializer=init_worker, initargs=(profiler.enabled,))
+        cleaned = pool.imap(clean, matches, chunksize=max(1, min(64, len(matches) // (jobs * 4))))
+    else:
+        pool = None
+        cleaned = map(clean, matches)
+    try:
+        for file_path, modified, error, profile_data in cleaned:
+            if profile_data:
+                profiler.merge(profile_data)
+            if error is not None:
+                print(f"Error processing {file_path}: {error}")
+                results['errors'].append(file_path)
+            elif modified:
+                print(f"{'Would modify' if check else 'Modified'}: {file_path}")
+                results['modified'].append(file_path)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    
+    if check:
+        print(f"Completed! {len(results['modified'])} files would be modified.")
+    else:
+        print(f"Completed! Modified {len(results['modified'])} files.")
+    if profiler.enabled:
+        profiler.write(profile_path)
+    return results
+
+def cli(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Remove console statements from .ts, .tsx and .vue files.")
+    parser.add_argument("src_dir", nargs="?", default=DEFAULT_SRC_DIR,
+                        help=f"Directory to clean (default: {DEFAULT_SRC_DIR})")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Number of worker processes (0 = CPU count, default: 1)")
+    parser.add_argument("--profile", nargs="?", const="remove_console_logs_profile.json", metavar="PATH",
+                        help="Write a Chrome trace of the run with per-file and per-stage spans")
+    add_walk_arguments(parser)
+    add_changed_files_arguments(parser)
+    add_hook_arguments(parser)
+    args = parser.parse_args(argv)
+    check_changed_files_arguments(parser, args)
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    walker = walker_from_arguments(args)
+    try:
+        # None unless --staged, --since or --files-from is given: the whole src_dir is walked
+        file_paths = changed_files_from_arguments(args, args.src_dir, SOURCE_EXTENSIONS, walker)
+        held_back = []
+        if args.restage:
+            # git add would also commit the unstaged changes of these files, so they are not touched
+            if file_paths is None:
+                file_paths = list(find_source_files(args.src_dir, walker))
+            file_paths, held_back = split_unstaged(file_paths, args.src_dir if os.path.isdir(args.src_dir) else '.')
+    except ChangedFilesError as e:
+        parser.error(str(e))
+    results = main(args.src_dir, args.profile, file_paths, walker, jobs, args.check)
+    if args.restage:
+        try:
+            restage(results['modified'])
+        except ChangedFilesError as e:
+            print(f"Error: {e}")
+            return 1
+    for file_path in held_back:
+        print(f"Skipped: {file_path} has unstaged changes; stage the whole file or stash the rest "
+              f"(git stash --keep-index) and commit again")
+    if results['errors'] or held_back or args.check and results['modified']:
+        return 1
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(cli())
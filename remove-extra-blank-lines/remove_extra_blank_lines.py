@@ -2,40 +2,151 @@
 
 import os
 import re
+import sys
+import argparse
 
-def remove_extra_blank_lines(file_path):
+# Directory walker honoring .gitignore, shared by every script
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'sourceWalker'))
+from sourceWalker import SourceWalker, add_walk_arguments, walker_from_arguments
+
+# Staged/changed file selection for hooks and CI, shared by the cleanup scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'gitChangedFiles'))
+from gitChangedFiles import (ChangedFilesError, add_changed_files_arguments, add_hook_arguments,
+                             check_changed_files_arguments, changed_files_from_arguments, restage,
+                             split_unstaged)
+
+# Atomic in-place rewrite through a uniquely named temporary file
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'atomicWrite'))
+from atomicWrite import write_lines_atomic
+
+DEFAULT_SRC_DIR = 'src'
+DEFAULT_MAX_BLANK_LINES = 1
+SOURCE_EXTENSIONS = ('.ts', '.tsx', '.vue')
+
+# Files are streamed in batches of whole lines of about this many characters
+BATCH_SIZE = 1 << 16
+
+WHITESPACE_LINE_RE = re.compile(r'^[^\S\n]+$', re.MULTILINE)
+
+def collapse_batch(text, blank_lines, max_blank_lines=DEFAULT_MAX_BLANK_LINES):
     """
-    Removes consecutive blank lines in a file and replaces them with a single blank line.
+    Collapse the blank lines of a batch of whole lines, given the number of blank
+    lines kept just before it. Whitespace-only lines become empty and \r\n and \r
+    line breaks become \n. Returns the new text and the number of blank lines it ends with.
     """
-    with open(file_path, 'r', encoding='utf-8') as file:
-        content = file.read()
+    text = WHITESPACE_LINE_RE.sub('', text.replace('\r\n', '\n').replace('\r', '\n'))
+    # Blank lines at the start of the batch continue the run of the previous batch
+    rest = text.lstrip('\n')
+    leading = max(0, min(len(text) - len(rest), max_blank_lines - blank_lines))
+    if not rest:
+        return '\n' * leading, blank_lines + leading
+    rest = re.sub('\n{%d,}' % (max_blank_lines + 2), '\n' * (max_blank_lines + 1), rest)
+    # The first trailing line break ends the last non-blank line
+    trailing = len(rest) - len(rest.rstrip('\n'))
+    return '\n' * leading + rest, max(0, trailing - 1)
+
+def collapse_file(file, max_blank_lines=DEFAULT_MAX_BLANK_LINES):
+    """Yield (batch, new batch) for a file opened with newline='', reading one batch at a time."""
+    blank_lines = 0
+    for lines in iter(lambda: file.readlines(BATCH_SIZE), []):
+        text = ''.join(lines)
+        new_text, blank_lines = collapse_batch(text, blank_lines, max_blank_lines)
+        yield text, new_text
+
+def collapsed_batches(file_path, max_blank_lines=DEFAULT_MAX_BLANK_LINES):
+    """Yield the collapsed batches of a file; the file is closed once they are exhausted, before it is replaced."""
+    with open(file_path, 'r', encoding='utf-8', newline='') as file:
+        for _, new_text in collapse_file(file, max_blank_lines):
+            yield new_text
 
-    # Replace 2 or more consecutive blank lines with a single blank line
-    new_content = re.sub(r'\n{3,}', '\n\n', content)
+def collapse_blank_lines(content, max_blank_lines=DEFAULT_MAX_BLANK_LINES):
+    """
+    Replaces consecutive blank lines in content with at most max_blank_lines blank lines.
+    """
+    return collapse_batch(content, 0, max_blank_lines)[0]
 
-    if new_content != content:
-        with open(file_path, 'w', encoding='utf-8') as file:
-            file.write(new_content)
+def remove_extra_blank_lines(file_path, max_blank_lines=DEFAULT_MAX_BLANK_LINES, write=True):
+    """
+    Removes consecutive blank lines in a file, keeping at most max_blank_lines of them.
+    Returns True if the file was modified, or with write unset, if it would be.
+    The file is streamed in batches of lines, so memory use does not depend on its
+    size: a first pass stops at the first batch to change, and only then is the
+    file rewritten into a temporary file that replaces it.
+    """
+    # newline='' keeps the original line breaks, so \r\n counts as a change
+    with open(file_path, 'r', encoding='utf-8', newline='') as file:
+        if all(new_text == text for text, new_text in collapse_file(file, max_blank_lines)):
+            return False
+    if not write:
         return True
 
-    return False
+    write_lines_atomic(file_path, collapsed_batches(file_path, max_blank_lines))
+    return True
+
+def find_source_files(src_dir, walker=None):
+    return (walker or SourceWalker()).files(src_dir, SOURCE_EXTENSIONS)
+
+def main(src_dir=DEFAULT_SRC_DIR, file_paths=None, walker=None, max_blank_lines=DEFAULT_MAX_BLANK_LINES, check=False):
+    """
+    Clean the files under src_dir, or only file_paths when given; with check, the
+    files are only reported. Returns the modified (or to be modified) files and the errors.
+    """
+    results = {'modified': [], 'errors': []}
 
-def main():
-    src_dir = 'src'
-    modified_count = 0
+    # file_paths is the list already collected by a caller, e.g. the changed files of a hook
+    for file_path in find_source_files(src_dir, walker) if file_paths is None else file_paths:
+        try:
+            if remove_extra_blank_lines(file_path, max_blank_lines, write=not check):
+                print(f"{'Would modify' if check else 'Modified'}: {file_path}")
+                results['modified'].append(file_path)
+        except Exception as e:
+            print(f"Error processing {file_path}: {e}")
+            results['errors'].append(file_path)
 
-    for root, _, files in os.walk(src_dir):
-        for file in files:
-            if file.endswith(('.ts', '.tsx', '.vue')):
-                file_path = os.path.join(root, file)
-                try:
-                    if remove_extra_blank_lines(file_path):
-                        print(f"Modified: {file_path}")
-                        modified_count += 1
-                except Exception as e:
-                    print(f"Error processing {file_path}: {e}")
+    if check:
+        print(f"Completed! {len(results['modified'])} files would be modified.")
+    else:
+        print(f"Completed! Modified {len(results['modified'])} files.")
+    return results
 
-    print(f"Completed! Modified {modified_count} files.")
+def cli(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Collapse consecutive blank lines in .ts, .tsx and .vue files.")
+    parser.add_argument("src_dir", nargs="?", default=DEFAULT_SRC_DIR,
+                        help=f"Directory to clean (default: {DEFAULT_SRC_DIR})")
+    parser.add_argument("--max-blank-lines", type=int, default=DEFAULT_MAX_BLANK_LINES, metavar="N",
+                        help=f"Maximum number of consecutive blank lines to keep (default: {DEFAULT_MAX_BLANK_LINES})")
+    add_walk_arguments(parser)
+    add_changed_files_arguments(parser)
+    add_hook_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.max_blank_lines < 0:
+        parser.error("--max-blank-lines must be 0 or more")
+    check_changed_files_arguments(parser, args)
+    walker = walker_from_arguments(args)
+    try:
+        # None unless --staged, --since or --files-from is given: the whole src_dir is walked
+        file_paths = changed_files_from_arguments(args, args.src_dir, SOURCE_EXTENSIONS, walker)
+        held_back = []
+        if args.restage:
+            # git add would also commit the unstaged changes of these files, so they are not touched
+            if file_paths is None:
+                file_paths = list(find_source_files(args.src_dir, walker))
+            file_paths, held_back = split_unstaged(file_paths, args.src_dir if os.path.isdir(args.src_dir) else '.')
+    except ChangedFilesError as e:
+        parser.error(str(e))
+    results = main(args.src_dir, file_paths, walker, args.max_blank_lines, args.check)
+    if args.restage:
+        try:
+            restage(results['modified'])
+        except ChangedFilesError as e:
+            print(f"Error: {e}")
+            return 1
+    for file_path in held_back:
+        print(f"Skipped: {file_path} has unstaged changes; stage the whole file or stash the rest "
+              f"(git stash --keep-index) and commit again")
+    if results['errors'] or held_back or args.check and results['modified']:
+        return 1
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(cli())
@@ -1,25 +1,70 @@
 import os
 import re
+import sys
+import hashlib
+import argparse
+import functools
+import multiprocessing
 
-def find_java_files(directory):
-    for root, dirs, files in os.walk(directory):
-        for file in files:
-            if file.endswith('.java'):
-                yield os.path.join(root, file)
-
-def extract_entity_info(file_path):
-    with open(file_path, 'r') as file:
-        content = file.read()
-        if '@Entity' in content:
-            package_match = re.search(r'package\s+([\w.]+)', content)
-            class_name = re.search(r'class\s+(\w+)', content)
-            fields = re.findall(r'private\s+(\w+(?:\s*<\s*\w+\s*>)?)\s+(\w+)', content)
-            if package_match and class_name and fields:
-                return package_match.group(1), class_name.group(1), fields
+# The Java lexer and its on-disk parse cache are shared with the other Java tools
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'javaParseCache'))
+from javaParseCache import JavaParseCache, add_cache_arguments, cache_from_arguments
+# Directory walker honoring .gitignore, shared by every script
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'sourceWalker'))
+from sourceWalker import SourceWalker, add_walk_arguments, walker_from_arguments
+
+DTO_TYPES = ("Request", "Response")
+
+# First line of every generated DTO: the fingerprint of the entity fields it was
+# rendered from and of the rest of the file, so --sync can tell stale from hand-edited
+GENERATED_HEADER = "// Generated by responseRequestGenerator; fields: {fields}; body: {body}"
+GENERATED_HEADER_RE = re.compile(r'// Generated by responseRequestGenerator; fields: ([0-9a-f]{16}); body: ([0-9a-f]{16})$')
+
+def find_java_files(directory, walker=None):
+    return (walker or SourceWalker()).files(directory, ('.java',))
+
+def find_java_directories(directory, walker=None):
+    """Yield (directory, Java file names) per package directory.
+
+    The listing from the walk doubles as the existence check for the DTOs,
+    so no per-file os.path.exists calls are needed.
+    """
+    for root, java_files in (walker or SourceWalker()).walk(directory, ('.java',)):
+        if java_files:
+            yield root, java_files
+
+def group_by_directory(java_files):
+    """Group an already collected file list like find_java_directories, keeping walk order."""
+    directories = {}
+    for java_file in java_files:
+        root, file = os.path.split(java_file)
+        directories.setdefault(root, []).append(file)
+    return list(directories.items())
+
+def extract_entity_info(file_path, parse_cache):
+    # Byte-level prefilter: files without @Entity are never decoded or parsed unless already cached
+    source = parse_cache.parse(file_path, (b'@Entity',))
+    if source is not None:
+        entity = source.find_class('Entity')
+        if source.package and entity:
+            fields = [(field.type, field.name) for field in source.instance_fields(entity.name)]
+            if fields:
+                return source.package, entity.name, fields
     return None, None, None
 
-def create_pojo(package, class_name, fields, file_type, entity_file_path):
-    pojo_content = f"""package {package};
+def fingerprint(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+def fields_fingerprint(package, fields):
+    return fingerprint('\n'.join([package] + [f"{field_type} {field_name}" for field_type, field_name in fields]))
+
+def render_pojo(package, class_name, fields, file_type):
+    body = render_pojo_body(package, class_name, fields, file_type)
+    header = GENERATED_HEADER.format(fields=fields_fingerprint(package, fields), body=fingerprint(body))
+    return f"{header}\n{body}"
+
+def render_pojo_body(package, class_name, fields, file_type):
+    return f"""package {package};
 
 import lombok.Data;
 import java.util.UUID;
@@ -29,24 +74,129 @@ public class {class_name}{file_type} {{
 {generate_fields(fields)}
 }}
 """
-    pojo_file = os.path.join(os.path.dirname(entity_file_path), f"{class_name}{file_type}.java")
-    if not os.path.exists(pojo_file):
-        with open(pojo_file, 'w') as file:
-            file.write(pojo_content)
-        print(f"Created {file_type}: {pojo_file}")
-    else:
-        print(f"{file_type} already exists: {pojo_file}")
 
 def generate_fields(fields):
     return '\n'.join(f"    private {field_type} {field_name};" for field_type, field_name in fields)
 
-def main(root_directory):
-    for java_file in find_java_files(root_directory):
-        package, entity_name, fields = extract_entity_info(java_file)
-        if package and entity_name and fields:
-            create_pojo(package, entity_name, fields, "Request", java_file)
-            create_pojo(package, entity_name, fields, "Response", java_file)
+def sync_pojo(pojo_file, package, fields):
+    """Return the status of an existing DTO under --sync: unchanged, stale, edited or unmanaged.
+
+    Only the header line is read unless the entity fields changed; the body is
+    then hashed to make sure nobody edited the file since it was generated.
+    """
+    with open(pojo_file, 'r', encoding='utf-8') as file:
+        match = GENERATED_HEADER_RE.match(file.readline().rstrip('\n'))
+        if not match:
+            return 'unmanaged'
+        if match.group(1) == fields_fingerprint(package, fields):
+            return 'unchanged'
+        if fingerprint(file.read()) != match.group(2):
+            return 'edited'
+    return 'stale'
+
+def process_directory(task, sync=False, parse_cache=None):
+    """Generate the DTOs of one package directory and write them as one batch.
+
+    Without sync existing DTOs are never touched; with sync generated DTOs whose
+    entity fields changed are rewritten. Returns the DTO paths per status.
+    """
+    dirpath, filenames = task
+    parse_cache = parse_cache or JavaParseCache(None)
+    existing = set(filenames)
+    outputs = []
+    results = {status: [] for status in ('created', 'updated', 'unchanged', 'edited', 'unmanaged', 'errors')}
+    for filename in filenames:
+        java_file = os.path.join(dirpath, filename)
+        try:
+            package, entity_name, fields = extract_entity_info(java_file, parse_cache)
+        except OSError as e:
+            results['errors'].append(f"{java_file}: {e}")
+            continue
+        if not (package and entity_name and fields):
+            continue
+        for file_type in DTO_TYPES:
+            pojo_name = f"{entity_name}{file_type}.java"
+            pojo_file = os.path.join(dirpath, pojo_name)
+            if pojo_name not in existing:
+                outputs.append(('created', pojo_file, render_pojo(package, entity_name, fields, file_type)))
+                existing.add(pojo_name)
+            elif not sync:
+                results['unchanged'].append(pojo_file)
+            else:
+                try:
+                    status = sync_pojo(pojo_file, package, fields)
+                except (OSError, UnicodeDecodeError) as e:
+                    results['errors'].append(f"{pojo_file}: {e}")
+                    continue
+                if status == 'stale':
+                    outputs.append(('updated', pojo_file, render_pojo(package, entity_name, fields, file_type)))
+                else:
+                    results[status].append(pojo_file)
+
+    for status, pojo_file, pojo_content in outputs:
+        try:
+            with open(pojo_file, 'w', encoding='utf-8') as file:
+                file.write(pojo_content)
+            results[status].append(pojo_file)
+        except OSError as e:
+            results['errors'].append(f"{pojo_file}: {e}")
+    return results
+
+def main(root_directory, jobs=1, verbose=False, sync=False, parse_cache=None, java_files=None, walker=None):
+    if java_files is None:
+        tasks = list(find_java_directories(root_directory, walker))
+    else:
+        tasks = group_by_directory(java_files)
+    results = {status: [] for status in ('created', 'updated', 'unchanged', 'edited', 'unmanaged', 'errors')}
+    process = functools.partial(process_directory, sync=sync, parse_cache=parse_cache)
+
+    def collect(directory_results):
+        for directory_result in directory_results:
+            for status, paths in directory_result.items():
+                results[status].extend(paths)
+
+    if jobs > 1 and len(tasks) > 1:
+        if parse_cache:
+            parse_cache.connect()
+        # Directories are independent, so they are handed out in any order
+        with multiprocessing.Pool(min(jobs, len(tasks))) as pool:
+            collect(pool.imap_unordered(process, tasks, chunksize=max(1, len(tasks) // (jobs * 4))))
+    else:
+        collect(map(process, tasks))
+
+    if verbose:
+        for status, label in (('created', 'Created'), ('updated', 'Updated'), ('unchanged', 'Up to date' if sync else 'Already exists'),
+                              ('unmanaged', 'Not generated')):
+            for pojo_file in sorted(results[status]):
+                print(f"{label}: {pojo_file}")
+    for pojo_file in sorted(results['edited']):
+        print(f"Warning: {pojo_file} was edited by hand, its entity changed but it is left as is")
+    for error in results['errors']:
+        print(f"Error: {error}")
+    summary = f"Created {len(results['created'])} DTO files"
+    if sync:
+        summary += (f", updated {len(results['updated'])}, {len(results['unchanged'])} up to date, "
+                    f"{len(results['edited'])} edited by hand, {len(results['unmanaged'])} not generated")
+    else:
+        summary += f", {len(results['unchanged'])} already existed"
+    print(f"{summary}, {len(results['errors'])} errors.")
+    return results
+
+def cli(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Generate Request/Response POJOs for Java JPA entities.")
+    parser.add_argument("root_dir", nargs="?", help="Root directory to search (prompted if omitted)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Number of worker processes (0 = CPU count, default: 1)")
+    parser.add_argument("--sync", action="store_true",
+                        help="Rewrite generated DTOs whose entity fields changed; hand-edited DTOs are kept")
+    parser.add_argument("-v", "--verbose", action="store_true", help="List every created and existing DTO")
+    add_cache_arguments(parser)
+    add_walk_arguments(parser)
+    args = parser.parse_args(argv)
+    root_dir = args.root_dir or input("Enter the root directory to search: ")
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    results = main(root_dir, jobs, args.verbose, args.sync, cache_from_arguments(args), walker=walker_from_arguments(args))
+    return 1 if results['errors'] else 0
 
 if __name__ == "__main__":
-    root_dir = input("Enter the root directory to search: ")
-    main(root_dir)
\ No newline at end of file
+    sys.exit(cli())
@@ -0,0 +1,290 @@
+import os
+import re
+import sys
+import argparse
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional, Iterable, Iterator, Pattern, Union
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+# Directory walker shared by every script of the repository. It replaces
+# os.walk with os.scandir, prunes dependency and build output directories,
+# honors .gitignore files and filters by extension on the directory entry
+# names, so no file is ever stat'ed.
+
+# Directories that never hold sources worth walking
+DEFAULT_PRUNE = ('node_modules', '.git')
+
+# Build output directories. A Java package or a frontend folder may have the
+# same name, so they are only pruned next to the build file of a project.
+BUILD_OUTPUT = ('dist', 'target', 'build')
+BUILD_FILES = ('pom.xml', 'build.gradle', 'build.gradle.kts', 'package.json')
+
+GITIGNORE = '.gitignore'
+
+# (pattern, negated, directories only)
+IgnoreRule = Tuple[Pattern[str], bool, bool]
+# (prefix length to strip, prefix to add, rules): the path of an entry relative to
+# the directory of its .gitignore is prefix + path_from_walk_root[strip:]
+IgnoreFrame = Tuple[int, str, List[IgnoreRule]]
+# (name, is directory, is symlink) per directory entry
+Listing = List[Tuple[str, bool, bool]]
+
+def translate_glob(pattern: str) -> str:
+    """Translate a .gitignore glob into a regular expression; * and ? never match '/'."""
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        char = pattern[i]
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+            continue
+        if char == '*':
+            parts.append('[^/]*')
+        elif char == '?':
+            parts.append('[^/]')
+        elif char == '[':
+            end = pattern.find(']', i + 2 if pattern.startswith(('[!', '[^'), i) else i + 1)
+            if end < 0:
+                parts.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end]
+                if body[:1] in ('!', '^'):
+                    body = '^' + body[1:]
+                parts.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end
+        elif char == '\\' and i + 1 < n:
+            i += 1
+            parts.append(re.escape(pattern[i]))
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    return ''.join(parts)
+
+def parse_gitignore(lines: Iterable[str]) -> List[IgnoreRule]:
+    """Compile the rules of a .gitignore file, following the gitignore(5) pattern format."""
+    rules = []
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if not line.endswith('\\ '):
+            line = line.rstrip(' ')
+        if not line or line.startswith('#'):
+            continue
+        negated = line.startswith('!')
+        if negated:
+            line = line[1:]
+        directories_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            continue
+        # A slash at the start or in the middle anchors the pattern to the .gitignore directory
+        anchored = '/' in line
+        regex = translate_glob(line.lstrip('/'))
+        if not anchored:
+            regex = '(?:.*/)?' + regex
+        rules.append((re.compile(regex + r'\Z', re.DOTALL), negated, directories_only))
+    return rules
+
+def read_gitignore(path: str) -> List[IgnoreRule]:
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as file:
+            return parse_gitignore(file)
+    except OSError:
+        return []
+
+def is_ignored(frames: List[IgnoreFrame], path: str, is_dir: bool) -> bool:
+    """Return whether the last rule matching path, innermost .gitignore first, excludes it."""
+    for strip, prefix, rules in reversed(frames):
+        relative = prefix + path[strip:]
+        for regex, negated, directories_only in reversed(rules):
+            if (is_dir or not directories_only) and regex.match(relative):
+                return not negated
+    return False
+
+def scan(directory: str) -> Listing:
+    """List a directory without stat calls; unreadable directories are empty, like in os.walk."""
+    listing = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                listing.append((entry.name, is_dir, is_dir and entry.is_symlink()))
+    except OSError:
+        pass
+    return listing
+
+def is_project(directory: str) -> bool:
+    """Return whether a directory holds the build file of a project, next to which build output is pruned."""
+    return any(os.path.isfile(os.path.join(directory, name)) for name in BUILD_FILES)
+
+class SourceWalker:
+    """Top-down directory walker honoring .gitignore files and a prune list.
+
+    Directories named in prune are skipped at any depth, those named in
+    build_output only in a directory holding one of the BUILD_FILES.
+
+    Directories are visited in the same order as os.walk and symlinked
+    directories are not followed. With gitignore set, the .gitignore files of
+    the walked tree apply, and so do those of its parent directories up to
+    the enclosing git repository. With threads > 1 the directories are
+    listed ahead of time by a thread pool, which hides the latency of network
+    file systems; the order of the results does not change.
+    """
+    def __init__(self, gitignore: bool = True, prune: Iterable[str] = DEFAULT_PRUNE, threads: int = 1,
+                 build_output: Iterable[str] = BUILD_OUTPUT):
+        self.gitignore = gitignore
+        self.prune = frozenset(prune)
+        self.build_output = frozenset(build_output)
+        self.threads = threads
+        self._rules: Dict[str, List[IgnoreRule]] = {}
+
+    def __getstate__(self) -> Dict[str, object]:
+        return {'gitignore': self.gitignore, 'prune': self.prune, 'threads': self.threads, 'build_output': self.build_output}
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__init__(**state)
+
+    def walk(self, root: str, extensions: Optional[Tuple[str, ...]] = None) -> Iterator[Tuple[str, List[str]]]:
+        """Yield (directory, file names) for every directory under root.
+
+        With extensions, only the names ending with one of them are listed;
+        the ignore rules are only matched against those names.
+        """
+        frames = self.parent_frames(root) if self.gitignore else []
+        if self.threads <= 1:
+            yield from self._walk(root, '', frames, scan(root), extensions, None)
+            return
+        # Imported here: concurrent.futures pulls in logging, which would slow down every hook run
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(self.threads)
+        try:
+            yield from self._walk(root, '', frames, executor.submit(scan, root), extensions, executor)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def files(self, root: str, extensions: Optional[Tuple[str, ...]] = None) -> Iterator[str]:
+        """Yield the path of every file under root, optionally only those with the given extensions."""
+        for directory, filenames in self.walk(root, extensions):
+            for filename in filenames:
+                yield os.path.join(directory, filename)
+
+    def _walk(self, directory: str, relative: str, frames: List[IgnoreFrame], listing: Union[Listing, 'Future[Listing]'],
+              extensions: Optional[Tuple[str, ...]], executor: Optional['ThreadPoolExecutor']) -> Iterator[Tuple[str, List[str]]]:
+        if executor is not None:
+            listing = listing.result()
+        if self.gitignore and any(name == GITIGNORE and not is_dir for name, is_dir, _ in listing):
+            rules = read_gitignore(os.path.join(directory, GITIGNORE))
+            if rules:
+                frames = frames + [(len(relative), '', rules)]
+
+        prune = self.prune
+        if self.build_output and any(not is_dir and name in BUILD_FILES for name, is_dir, _ in listing):
+            prune = prune | self.build_output
+        filenames = []
+        subdirectories = []
+        for name, is_dir, is_symlink in listing:
+            if is_dir:
+                if is_symlink or name in prune or (frames and is_ignored(frames, relative + name, True)):
+                    continue
+                subdirectories.append(name)
+            elif (extensions is None or name.endswith(extensions)) and not (frames and is_ignored(frames, relative + name, False)):
+                filenames.append(name)
+
+        paths = [os.path.join(directory, name) for name in subdirectories]
+        # Start listing the subdirectories before the caller consumes this one
+        listings = [executor.submit(scan, path) for path in paths] if executor is not None else None
+        yield directory, filenames
+        for i, (name, path) in enumerate(zip(subdirectories, paths)):
+            yield from self._walk(path, relative + name + '/', frames, listings[i] if listings else scan(path), extensions, executor)
+
+    def parent_frames(self, root: str) -> List[IgnoreFrame]:
+        """Return the rules of the .gitignore files above root, up to the enclosing git repository."""
+        directory = os.path.abspath(root)
+        parents = []
+        prefix = ''
+        while not os.path.exists(os.path.join(directory, '.git')):
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                # Not inside a git repository: only the .gitignore files under root apply
+                return []
+            prefix = os.path.basename(directory) + '/' + prefix
+            directory = parent
+            parents.append((directory, prefix))
+        frames = []
+        for directory, prefix in reversed(parents):
+            rules = self._cached_rules(directory)
+            if rules:
+                frames.append((0, prefix, rules))
+        return frames
+
+    def _cached_rules(self, directory: str) -> List[IgnoreRule]:
+        if directory not in self._rules:
+            self._rules[directory] = read_gitignore(os.path.join(directory, GITIGNORE))
+        return self._rules[directory]
+
+    def ignores(self, root: str, path: str) -> bool:
+        """Return whether walking root would skip path, e.g. for file system events."""
+        relative = os.path.relpath(path, root)
+        if relative == os.curdir or relative.startswith(os.pardir + os.sep):
+            return False
+        parts = relative.split(os.sep)
+        directory = root
+        for part in parts[:-1]:
+            if part in self.prune or part in self.build_output and is_project(directory):
+                return True
+            directory = os.path.join(directory, part)
+        if not self.gitignore:
+            return False
+        frames = self.parent_frames(root)
+        directory = root
+        current = ''
+        for i, part in enumerate(parts):
+            rules = self._cached_rules(os.path.abspath(directory))
+            if rules:
+                frames = frames + [(len(current), '', rules)]
+            current += part
+            is_dir = i < len(parts) - 1 or os.path.isdir(path)
+            if is_ignored(frames, current, is_dir):
+                return True
+            current += '/'
+            directory = os.path.join(directory, part)
+        return False
+
+def add_walk_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--no-ignore", action="store_true",
+                        help=f"Also walk .gitignore'd paths, {', '.join(DEFAULT_PRUNE)} and build output "
+                             f"({', '.join(BUILD_OUTPUT)} next to {', '.join(BUILD_FILES)})")
+    parser.add_argument("--walk-threads", type=int, default=1, metavar="N",
+                        help="List directories with N threads, e.g. on network file systems (default: 1)")
+
+def walker_from_arguments(args: argparse.Namespace) -> SourceWalker:
+    if args.no_ignore:
+        return SourceWalker(gitignore=False, prune=(), threads=args.walk_threads, build_output=())
+    return SourceWalker(threads=args.walk_threads)
+
+def cli(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog=prog, description="List the files the easy-scripts tools walk under a directory.")
+    parser.add_argument("root_dir", nargs="?", default=".", help="Directory to walk (default: .)")
+    parser.add_argument("-e", "--extension", action="append", dest="extensions", metavar="EXT",
+                        help="Only list files with this extension, e.g. .java (repeatable)")
+    parser.add_argument("-c", "--count", action="store_true", help="Print the number of files instead of their paths")
+    add_walk_arguments(parser)
+    args = parser.parse_args(argv)
+    files = walker_from_arguments(args).files(args.root_dir, tuple(args.extensions) if args.extensions else None)
+    if args.count:
+        print(sum(1 for _ in files))
+    else:
+        for path in files:
+            print(path)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(cli())
@@ -0,0 +1,115 @@
+import os
+import json
+import time
+import tracemalloc
+from typing import Dict, List, Tuple, Any
+
+# Profiler behind the --profile option of the Java generators and
+# remove-console-logs. It records Chrome trace spans per file and per stage,
+# file and byte counters and the peak memory reported by tracemalloc.
+# Disabled instances hand out a shared no-op span, so instrumented code costs
+# next to nothing without --profile.
+
+ProfileData = Tuple[List[Dict[str, Any]], Dict[str, int], int]
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NO_SPAN = _NoSpan()
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'category', 'args', 'start')
+
+    def __init__(self, profiler: 'Profiler', name: str, category: str, args: Dict[str, Any]):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        duration = time.perf_counter_ns() - self.start
+        self.profiler.events.append({
+            'name': self.name, 'cat': self.category, 'ph': 'X',
+            'ts': self.start / 1000, 'dur': duration / 1000,
+            'pid': os.getpid(), 'tid': os.getpid(), 'args': self.args
+        })
+        return False
+
+class Profiler:
+    """Collects Chrome trace spans, file/byte counters and peak memory (tracemalloc)."""
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.events: List[Dict[str, Any]] = []
+        self.counters = {'files': 0, 'bytes_read': 0, 'bytes_written': 0}
+        self.peak_memory = 0
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def span(self, name: str, category: str = 'stage', **args: Any):
+        """Return a context manager recording a span; a no-op when disabled."""
+        return _Span(self, name, category, args) if self.enabled else _NO_SPAN
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        if self.enabled:
+            self.counters[counter] += amount
+
+    def count_text(self, counter: str, text: str) -> None:
+        """Count the UTF-8 size of text; the text is only encoded when enabled."""
+        if self.enabled:
+            self.counters[counter] += len(text.encode('utf-8'))
+
+    def count_file_size(self, counter: str, path: str) -> None:
+        if self.enabled:
+            self.counters[counter] += os.path.getsize(path)
+
+    def collect(self) -> ProfileData:
+        """Return and reset the data of this process, e.g. to send it from a worker."""
+        if self.enabled:
+            self.peak_memory = max(self.peak_memory, tracemalloc.get_traced_memory()[1])
+        data = (self.events, self.counters, self.peak_memory)
+        self.events = []
+        self.counters = dict.fromkeys(self.counters, 0)
+        return data
+
+    def merge(self, data: ProfileData) -> None:
+        events, counters, peak_memory = data
+        self.events.extend(events)
+        for counter, amount in counters.items():
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+        self.peak_memory = max(self.peak_memory, peak_memory)
+
+    def write(self, output_path: str, slowest: int = 10) -> None:
+        """Write a Chrome trace (chrome://tracing, Perfetto) and print a summary."""
+        self.merge(self.collect())
+        origin = min((event['ts'] for event in self.events), default=0)
+        for event in self.events:
+            event['ts'] -= origin
+        with open(output_path, 'w', encoding='utf-8') as file:
+            json.dump({
+                'traceEvents': self.events,
+                'displayTimeUnit': 'ms',
+                'otherData': {**self.counters, 'peak_memory_bytes': self.peak_memory}
+            }, file)
+
+        print(f"Profile written to {output_path}")
+        print(f"Files: {self.counters['files']}, read: {self.counters['bytes_read']} bytes, "
+              f"written: {self.counters['bytes_written']} bytes, peak memory: {self.peak_memory / 1024 / 1024:.1f} MiB")
+        totals: Dict[str, float] = {}
+        for event in self.events:
+            if event['cat'] == 'stage':
+                totals[event['name']] = totals.get(event['name'], 0) + event['dur']
+        for name, duration in totals.items():
+            print(f"  {name:<10} {duration / 1000:10.1f} ms")
+        files = sorted((event for event in self.events if event['cat'] == 'file'), key=lambda event: -event['dur'])
+        if files:
+            print("Slowest files:")
+            for event in files[:slowest]:
+                print(f"  {event['dur'] / 1000:10.1f} ms  {event['args'].get('path')}")